@@ -0,0 +1,150 @@
+"""
+Module holding the HTTP connection pools and helpers shared by the clients of the toolbox.
+"""
+
+import base64
+import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+# orjson encodes and decodes large JSON documents several times faster, it is used when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ADAPTER = None
+_ADAPTER_LOCK = threading.Lock()
+
+
+def new_session():
+    """
+    Returns a new requests session for a client, mounted on the connection pools shared by the clients.
+
+    Sharing one adapter lets the clients reuse each other's pooled connections instead of each
+    keeping their own, while each client keeps its own session and therefore its own cookie jar,
+    so the session cookies set for one account are never sent on behalf of another. urllib3 keeps
+    a separate pool per host, so clients of different servers do not interfere.
+
+    The session must not be closed, as closing it would also close the shared connection pools.
+
+    Returns:
+        requests.Session: The new session.
+    """
+    global _ADAPTER  # pylint: disable=global-statement
+
+    with _ADAPTER_LOCK:
+        if _ADAPTER is None:
+            # Retry the requests failing on transient gateway errors. Once the retries are exhausted
+            # the last response is returned, so callers get an HTTPError from raise_for_status
+            # rather than a RetryError
+            _ADAPTER = HTTPAdapter(
+                pool_connections=50,
+                pool_maxsize=100,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[502, 503, 504],
+                    raise_on_status=False
+                    )
+                )
+
+    session = requests.Session()
+    session.mount("http://", _ADAPTER)
+    session.mount("https://", _ADAPTER)
+    return session
+
+
+def prune_cache(cache, max_size):
+    """
+    Removes the expired entries of an in-memory cache, then its least recently used entries above max_size.
+    The caller holds the lock of the cache.
+
+    Args:
+        cache (OrderedDict): The cache, mapping a key to a tuple of its expiry time on the time.monotonic
+            clock and its value, ordered from the least to the most recently used entry.
+        max_size (int): The maximum number of entries kept.
+    """
+    now = time.monotonic()
+    for key in [key for key, (expiry, _) in cache.items() if expiry <= now]:
+        del cache[key]
+    while len(cache) > max_size:
+        cache.popitem(last=False)
+
+
+class BasicAuth(HTTPBasicAuth):
+    """
+    HTTP basic authentication encoding the credentials once rather than on every request.
+
+    Passed as the auth of the requests rather than as an Authorization header, so that requests
+    does not replace it with the credentials of a ~/.netrc file.
+    """
+
+    def __init__(self, username, password):
+        """
+        Initializes the authentication and builds its header.
+
+        Args:
+            username (str): The username.
+            password (str): The password.
+        """
+        super().__init__(username, password)
+        token = base64.b64encode(f"{username}:{password}".encode("latin1")).decode("ascii")
+        self._header = f"Basic {token}"
+
+    def __call__(self, request):
+        request.headers["Authorization"] = self._header
+        return request
+
+
+def basic_auth(username, password):
+    """
+    Builds the authentication of the requests of a client with HTTP basic authentication.
+
+    Args:
+        username (str): The username, no authentication is built if it is None.
+        password (str): The password.
+
+    Returns:
+        BasicAuth: The authentication, or None without credentials.
+    """
+    if username is None:
+        return None
+    return BasicAuth(username, password)
+
+
+def json_dumps(obj):
+    """
+    Serializes an object to JSON.
+
+    Args:
+        obj (dict or list): The object to serialize.
+
+    Returns:
+        bytes or str: The JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj)
+
+
+def json_loads(content):
+    """
+    Deserializes a JSON document.
+
+    Args:
+        content (bytes): The JSON document.
+
+    Returns:
+        dict: The deserialized object.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
@@ -2,8 +2,17 @@
 Module to interact with the DHIS2 server and manage metadata and data values.
 """
 
-import json
-import requests
+import gzip
+from msftoolbox._http import basic_auth, new_session, json_dumps, json_loads
+
+# ijson parses the data values of a response while it is downloaded, it is used when installed
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Request bodies smaller than this are not worth compressing
+_GZIP_MIN_SIZE = 1024
 
 
 class Dhis2DataValuesClient:
@@ -13,7 +22,7 @@ class Dhis2DataValuesClient:
     This class provides methods to send, read, and delete data values in DHIS2.
     """
 
-    def __init__(self, username=None, password=None, server_url=None, timeout=10):
+    def __init__(self, username=None, password=None, server_url=None, timeout=10, session=None, compress=False):
         """
         Initializes the DhisDataValues instance with optional DHIS2 server credentials and URL.
 
@@ -22,11 +31,33 @@ class Dhis2DataValuesClient:
             password (str, optional): DHIS2 password. Defaults to None.
             server_url (str, optional): DHIS2 server URL. Defaults to None.
             timeout (int, optional): Default timeout for requests in seconds. Defaults to 10.
+            session (requests.Session, optional): The session used for the requests.
+                Defaults to a new session sharing the connection pools of the toolbox clients.
+            compress (bool, optional): Whether to gzip the data value sets larger than 1KB sent to the server.
+                The server, or the proxy in front of it, must accept gzip encoded request bodies. Defaults to False.
         """
         self.dhis2_username = username
         self.dhis2_password = password
         self.dhis2_server_url = server_url
         self.timeout = timeout
+        self.compress = compress
+        self._auth = basic_auth(username, password)
+
+        # A persistent session keeps the connections to the server alive between requests
+        self.session = session if session is not None else new_session()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases the client at the end of a with block.
+        The session is left open, as its connection pools are either shared by the clients of the toolbox
+        or provided by the caller, who remains responsible for closing them.
+        """
 
     def configure_dhis2_server(self, username=None, password=None, server_url=None):
         """
@@ -45,6 +76,7 @@ class Dhis2DataValuesClient:
             self.dhis2_password = password
         if server_url is not None:
             self.dhis2_server_url = server_url
+        self._auth = basic_auth(self.dhis2_username, self.dhis2_password)
 
     def send_data_values(self, data_values, content_type='json', **kwargs):
         """
@@ -65,19 +97,46 @@ class Dhis2DataValuesClient:
         params = {k: v for k, v in kwargs.items() if v is not None}
 
         if content_type == 'json':
-            data = json.dumps(data_values)
+            data = json_dumps(data_values)
         else:
             data = data_values
 
-        response = requests.post(
+        if self.compress and len(data) > _GZIP_MIN_SIZE:
+            headers['Content-Encoding'] = 'gzip'
+            data = gzip.compress(data.encode() if isinstance(data, str) else data, compresslevel=6)
+
+        response = self.session.post(
             url,
-            auth=(self.dhis2_username, self.dhis2_password),
             headers=headers,
+            auth=self._auth,
             params=params,
             data=data,
         )
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content) if response.content else {}
+
+    def send_data_values_batch(self, data_values, chunk_size=1000, **kwargs):
+        """
+        Sends a list of data values to the DHIS2 server in dataValueSets of up to chunk_size data values.
+        Prefer it to send_individual_data_value for bulk imports, which needs one request per data value.
+
+        Args:
+            data_values (list): The data values to send, each a dictionary as accepted by send_individual_data_value.
+            chunk_size (int, optional): The maximum number of data values sent per request. Defaults to 1000.
+            **kwargs: Additional query parameters for the requests.
+
+        Returns:
+            list: The responses from the DHIS2 server, one per request.
+
+        Raises:
+            ValueError: If chunk_size is not positive.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        return [
+            self.send_data_values({'dataValues': data_values[i:i + chunk_size]}, content_type='json', **kwargs)
+            for i in range(0, len(data_values), chunk_size)
+        ]
 
     def read_data_values(self, **kwargs):
         """
@@ -92,13 +151,44 @@ class Dhis2DataValuesClient:
         url = f'{self.dhis2_server_url}/api/dataValueSets'
         params = {k: v for k, v in kwargs.items() if v is not None}
 
-        response = requests.get(
+        response = self.session.get(
             url,
-            auth=(self.dhis2_username, self.dhis2_password),
+            auth=self._auth,
             params=params,
         )
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content) if response.content else {}
+
+    def read_data_values_iter(self, **kwargs):
+        """
+        Reads data values from the DHIS2 server one by one.
+        When ijson is installed the response is parsed while it is downloaded, so the
+        memory used does not grow with the number of data values.
+
+        Args:
+            **kwargs: Query parameters for the request.
+
+        Yields:
+            dict: A data value from the DHIS2 server.
+        """
+        url = f'{self.dhis2_server_url}/api/dataValueSets'
+        params = {k: v for k, v in kwargs.items() if v is not None}
+
+        with self.session.get(
+            url,
+            auth=self._auth,
+            params=params,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+
+            if ijson is None:
+                yield from json_loads(response.content).get('dataValues', [])
+            else:
+                # Let urllib3 decompress the raw stream before it is parsed
+                response.raw.decode_content = True
+                # Numbers are parsed as floats rather than Decimals, like the json module does
+                yield from ijson.items(response.raw, 'dataValues.item', use_float=True)
 
     def delete_data_value(self, data_element, period, org_unit, category_option_combo=None, attribute_option_combo=None):
         """
@@ -112,7 +202,7 @@ class Dhis2DataValuesClient:
             attribute_option_combo (str, optional): The attribute option combo identifier. Defaults to None.
 
         Returns:
-            dict: The response from the DHIS2 server.
+            dict: The response from the DHIS2 server, empty if the server returns no content.
         """
         url = f'{self.dhis2_server_url}/api/dataValues'
         params = {
@@ -123,17 +213,18 @@ class Dhis2DataValuesClient:
             'cc': attribute_option_combo,
         }
 
-        response = requests.delete(
+        response = self.session.delete(
             url,
-            auth=(self.dhis2_username, self.dhis2_password),
+            auth=self._auth,
             params=params,
         )
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content) if response.content else {}
 
     def send_individual_data_value(self, data_value):
         """
         Sends an individual data value to the DHIS2 server.
+        To send many data values, use send_data_values_batch instead.
 
         Args:
             data_value (dict): The data value to send. This should be a dictionary.
@@ -143,16 +234,16 @@ class Dhis2DataValuesClient:
         """
         url = f'{self.dhis2_server_url}/api/dataValues'
         headers = {'Content-Type': 'application/json'}
-        data = json.dumps(data_value)
+        data = json_dumps(data_value)
 
-        response = requests.post(
+        response = self.session.post(
             url,
-            auth=(self.dhis2_username, self.dhis2_password),
             headers=headers,
+            auth=self._auth,
             data=data,
         )
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content) if response.content else {}
 
     def read_individual_data_value(self, data_element, period, org_unit, category_option_combo=None, attribute_option_combo=None):
         """
@@ -177,10 +268,10 @@ class Dhis2DataValuesClient:
             'cc': attribute_option_combo,
         }
 
-        response = requests.get(
+        response = self.session.get(
             url,
-            auth=(self.dhis2_username, self.dhis2_password),
+            auth=self._auth,
             params=params,
         )
         response.raise_for_status()
-        return response.json()
\ No newline at end of file
+        return json_loads(response.content)
\ No newline at end of file
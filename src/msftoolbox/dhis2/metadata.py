@@ -2,7 +2,13 @@
 Module to interact with the DHIS2 server and manage metadata and data values.
 """
 
-import requests
+import threading
+import time
+from collections import OrderedDict
+from msftoolbox._http import basic_auth, new_session, json_loads, prune_cache
+
+# The number of responses kept by the cache
+_CACHE_SIZE = 256
 
 
 class Dhis2MetadataClient:
@@ -14,7 +20,7 @@ class Dhis2MetadataClient:
     and data sets.
     """
 
-    def __init__(self, username=None, password=None, server_url=None, timeout=10):
+    def __init__(self, username=None, password=None, server_url=None, timeout=10, session=None, cache_ttl=None):
         """
         Initializes the DhisMetadata instance with optional DHIS2 server credentials and URL.
 
@@ -23,11 +29,40 @@ class Dhis2MetadataClient:
             password (str, optional): DHIS2 password. Defaults to None.
             server_url (str, optional): DHIS2 server URL. Defaults to None.
             timeout (int, optional): Default timeout for requests in seconds. Defaults to 10.
+            session (requests.Session, optional): The session used for the requests.
+                Defaults to a new session sharing the connection pools of the toolbox clients.
+            cache_ttl (dict, optional): The number of seconds the responses of each endpoint are cached for,
+                e.g. {'indicators': 3600, 'organisationUnits': 86400}. Endpoints not listed are not cached.
+                Defaults to None, disabling the cache.
         """
         self.dhis2_username = username
         self.dhis2_password = password
         self.dhis2_server_url = server_url
         self.timeout = timeout
+        self._auth = basic_auth(username, password)
+
+        # A persistent session keeps the connections to the server alive between requests.
+        # requests asks for gzip compressed responses by default
+        self.session = session if session is not None else new_session()
+
+        # The cached responses, mapping a URL and its parameters to an expiry time and the response body,
+        # least recently used first
+        self.cache_ttl = cache_ttl or {}
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases the client at the end of a with block.
+        The session is left open, as its connection pools are either shared by the clients of the toolbox
+        or provided by the caller, who remains responsible for closing them.
+        """
 
     def configure_dhis2_server(self, username=None, password=None, server_url=None):
         """
@@ -46,10 +81,39 @@ class Dhis2MetadataClient:
             self.dhis2_password = password
         if server_url is not None:
             self.dhis2_server_url = server_url
+        self._auth = basic_auth(self.dhis2_username, self.dhis2_password)
+
+        # The cached responses may come from another server or account
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """
+        Removes all the cached responses.
+        """
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _endpoint_ttl(self, url):
+        """
+        Returns the number of seconds the responses of the endpoint of a URL are cached for.
+
+        Args:
+            url (str): The URL of the request.
+
+        Returns:
+            float: The time to live of the endpoint, 0 if it is not cached.
+        """
+        if not self.cache_ttl:
+            return 0
+        endpoint = url.split('/api/', 1)[-1].split('?', 1)[0].split('/', 1)[0]
+        return self.cache_ttl.get(endpoint, 0)
 
     def get_response(self, url, params=None, timeout=None):
         """
         Makes an authenticated GET request to the specified URL and returns the JSON response.
+        Responses of the endpoints listed in cache_ttl are served from the cache until they expire.
+        Expired responses are dropped when a response is stored, and the least recently used
+        ones are evicted above _CACHE_SIZE.
 
         Args:
             url (str): The URL to send the GET request to.
@@ -65,16 +129,32 @@ class Dhis2MetadataClient:
         """
         if timeout is None:
             timeout = self.timeout
-        response = requests.get(
+
+        # The body is cached rather than the data and parsed on every hit, so callers get their own copy
+        # and can modify it freely
+        ttl = self._endpoint_ttl(url)
+        cache_key = (url, repr(sorted((params or {}).items())))
+        if ttl:
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None and time.monotonic() < cached[0]:
+                    self._cache.move_to_end(cache_key)
+                    return json_loads(cached[1])
+
+        response = self.session.get(
             url,
-            auth=(self.dhis2_username, self.dhis2_password),
+            auth=self._auth,
             params=params,
         )
         if response.status_code == 401:
             raise ValueError("Authentication failed. Check your username and password.")
         response.raise_for_status()
 
-        return response.json()
+        if ttl:
+            with self._cache_lock:
+                self._cache[cache_key] = (time.monotonic() + ttl, response.content)
+                prune_cache(self._cache, _CACHE_SIZE)
+        return json_loads(response.content)
 
     def get_organisation_units(self, **kwargs):
         """
@@ -365,6 +445,8 @@ class Dhis2MetadataClient:
     def get_data_elements_for_org_unit(self, org_unit_uid):
         """
         Retrieves all data elements for a specific organization unit from DHIS2.
+        The data sets of the organization unit and their elements are requested in a single call,
+        and data sets listed more than once are only counted once.
 
         Args:
             org_unit_uid (str): The UID of the organization unit.
@@ -372,24 +454,22 @@ class Dhis2MetadataClient:
         Returns:
             list: List of dictionaries representing data elements.
         """
-        url = f'{self.dhis2_server_url}/api/organisationUnits/{org_unit_uid}?fields=dataSets'
+        url = (
+            f'{self.dhis2_server_url}/api/organisationUnits/{org_unit_uid}'
+            '?fields=dataSets[id,dataSetElements[dataElement]]'
+        )
         data = self.get_response(url)
-        data_sets = data.get('dataSets', [])
-
-        data_elements = []
-        for data_set in data_sets:
-            data_set_id = data_set['id']
-            url = (
-                f'{self.dhis2_server_url}/api/dataSets/{data_set_id}?fields=dataSetElements[dataElement]'
-            )
-            data_set_data = self.get_response(url)
-            data_set_elements = data_set_data.get('dataSetElements', [])
-
-            for element in data_set_elements:
-                data_element = element['dataElement']
-                data_elements.append(data_element)
-
-        return data_elements
+        data_sets = data.get('dataSets')
+        if not data_sets:
+            return []
+
+        # A data set linked to the organization unit more than once only contributes its elements once
+        unique_data_sets = {data_set['id']: data_set for data_set in data_sets}
+        return [
+            element['dataElement']
+            for data_set in unique_data_sets.values()
+            for element in data_set.get('dataSetElements', [])
+        ]
 
     def get_predictors(self):
         """
@@ -422,15 +502,15 @@ class Dhis2MetadataClient:
 
         params = {k: v for k, v in kwargs.items() if v is not None}
 
-        response = requests.get(
+        response = self.session.get(
             url,
-            auth=(self.dhis2_username, self.dhis2_password),
+            auth=self._auth,
             params=params,
         )
 
         response.raise_for_status()
         if response.status_code == 200:
-            return response.json()
+            return json_loads(response.content)
         else:
             raise ValueError(
                 f'Expected `200` http status response code, received: {response.status_code}'
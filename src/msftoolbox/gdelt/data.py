@@ -1,6 +1,18 @@
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 import requests
 import newspaper
+import newspaper.network
+from msftoolbox._http import new_session
+
+# The number of downloaded reports kept in memory
+_REPORT_CACHE_SIZE = 1024
+
+# The number of seconds a failed download is remembered before it can be retried
+_FAILED_REPORT_TTL = 60
 
 class GDELTClient:
     """
@@ -12,7 +24,9 @@ class GDELTClient:
     def __init__(
         self,
         sort="HybridRel",
-        limit=50
+        limit=50,
+        timeout=10,
+        session: requests.Session = None
         ):
         """
         Initialise the client and store configurations
@@ -20,9 +34,20 @@ class GDELTClient:
         Args:
             sort (str, optional): The sorting mechanism for the API. Defaults to "HybridRel".
             limit (int, optional): The default value for the number of articles to list. Defaults to 50.
+            timeout (int, optional): The timeout of the requests in seconds. Defaults to 10.
+            session (requests.Session, optional): The session used for the requests and article downloads.
+                Defaults to a new session sharing the connection pools of the toolbox clients.
         """
         self.sort = sort
         self.limit = limit
+        self.timeout = timeout
+
+        # A persistent session reuses the connections to the API and to the news sites between requests
+        self.session = session if session is not None else new_session()
+
+        # The downloaded report texts by url, with the time a failed download expires
+        self._report_cache = OrderedDict()
+        self._report_cache_lock = threading.Lock()
 
     def list_reports(
         self,
@@ -54,17 +79,17 @@ class GDELTClient:
         """
         # Format dates and store url
         base_url = "https://api.gdeltproject.org/api/v2/doc/doc"
-        dt_start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        dt_end_date = datetime.strptime(end_date, "%Y-%m-%d")
-        api_formatted_start_date = datetime.strftime(dt_start_date, "%Y%m%d%H%M%S")
-        api_formatted_end_date = datetime.strftime(dt_end_date, "%Y%m%d%H%M%S")
+        dt_start_date = date.fromisoformat(start_date)
+        dt_end_date = date.fromisoformat(end_date)
+        api_formatted_start_date = f"{dt_start_date:%Y%m%d}000000"
+        api_formatted_end_date = f"{dt_end_date:%Y%m%d}000000"
 
         # Apply default source language
         if source_languages_filter is None:
             source_languages_filter = ["english"]
 
         # Check validity of start and end date
-        if dt_end_date - dt_start_date <= timedelta(0):
+        if dt_end_date <= dt_start_date:
             raise ValueError("End date must be after start date")
 
         # Add the filters to the query value
@@ -91,7 +116,7 @@ class GDELTClient:
         }
 
         # Perform get request and process data. Assign message for failure.
-        response = requests.get(base_url, params=params)
+        response = self.session.get(base_url, params=params, timeout=self.timeout)
         response.raise_for_status()
 
         try:
@@ -106,6 +131,7 @@ class GDELTClient:
         report_url: str
         ) -> dict:
         """Get a report based on the report url.
+        Reports are downloaded once per client. Failed downloads are retried after a minute.
 
         Args:
             report_url (str): The url for the report. Typically the href from the list_reports response
@@ -113,14 +139,72 @@ class GDELTClient:
         Returns:
             dict: Returns the article text containing the full report information or None if an error occurs.
         """
+        with self._report_cache_lock:
+            cached = self._report_cache.get(report_url)
+            if cached is not None:
+                self._report_cache.move_to_end(report_url)
+        if cached is not None and (cached[0] is None or time.monotonic() < cached[0]):
+            return {"text": cached[1]}
+
+        text = self._download_report(report_url)
+        expiry = None if text is not None else time.monotonic() + _FAILED_REPORT_TTL
+        with self._report_cache_lock:
+            self._report_cache[report_url] = (expiry, text)
+            self._report_cache.move_to_end(report_url)
+            if len(self._report_cache) > _REPORT_CACHE_SIZE:
+                self._report_cache.popitem(last=False)
+        return {"text": text}
+
+    def _download_report(
+        self,
+        report_url: str
+        ) -> str:
+        """Download and parse the text of a report.
+
+        Args:
+            report_url (str): The url for the report.
+
+        Returns:
+            str: The text of the report or None if it is empty or an error occurs.
+        """
         try:
+            # The article is downloaded with the session rather than by newspaper, which opens
+            # a new connection for every article, but with the browser User-Agent and the request
+            # arguments newspaper would send, as many news sites reject other clients
             page = newspaper.Article(report_url)
-            page.download()
+            response = self.session.get(
+                report_url,
+                **newspaper.network.get_request_kwargs(
+                    self.timeout,
+                    page.config.browser_user_agent,
+                    page.config.proxies,
+                    page.config.headers
+                    )
+                )
+            response.raise_for_status()
+
+            # Decoded like newspaper does, which falls back on the charset of the HTML meta tags
+            # when the Content-Type header has none, rather than on the ISO-8859-1 default of requests
+            page.set_html(newspaper.network._get_html_from_response(response))  # pylint: disable=protected-access
             page.parse()
-            if page.text:
-                return {"text": page.text}
-            else:
-                return {"text": None}
+            return page.text or None
         except Exception as ex:
             print(f"Error downloading article from {report_url}: {str(ex)}")
-            return {"text": None}
+            return None
+
+    def get_reports(
+        self,
+        report_urls: list,
+        max_workers: int = 16
+        ) -> list:
+        """Get several reports based on their urls, downloading them concurrently.
+
+        Args:
+            report_urls (list): The urls of the reports. Typically the hrefs from the list_reports response
+            max_workers (int, optional): The maximum number of reports downloaded at the same time. Defaults to 16.
+
+        Returns:
+            list: The report of each url as returned by get_report, in the order of the urls.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get_report, report_urls))
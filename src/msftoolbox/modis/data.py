@@ -1,4 +1,5 @@
 import requests
+from msftoolbox._http import new_session
 
 
 class ModisClient:
@@ -9,11 +10,24 @@ class ModisClient:
 
     MODIS_API_URL = """https://modis.ornl.gov/rst/api/v1/"""
 
-    def __init__(self, product, longitude, latitude):
+    def __init__(self, product, longitude, latitude, session: requests.Session = None):
+        """
+        Initialises the client for a product and a point of interest.
+
+        Args:
+            product (str): The MODIS product.
+            longitude (float): The longitude of the point of interest.
+            latitude (float): The latitude of the point of interest.
+            session (requests.Session, optional): The session used for the requests.
+                Defaults to a new session sharing the connection pools of the toolbox clients.
+        """
         self.product = product
         self.longitude = longitude
         self.latitude = latitude
 
+        # A persistent session keeps the connections to the API alive between requests
+        self.session = session if session is not None else new_session()
+
     def get_modis_product_dates(self):
         """
         MODIS releases data in 8-day cycles. This will return a list of valid dates in AYYYYDDD format.
@@ -22,7 +36,7 @@ class ModisClient:
             dict: A dictionary with a list of the valid MODIS and calendar dates.
         """
         date_url = f"{self.MODIS_API_URL}/{self.product}/dates?latitude={self.latitude}&longitude={self.longitude}"
-        response = requests.get(date_url)
+        response = self.session.get(date_url)
 
         response.raise_for_status()
 
@@ -36,7 +50,7 @@ class ModisClient:
             dict: A dictionary with a list of the available bands for the product.
         """
         date_url = f"{self.MODIS_API_URL}/{self.product}/bands"
-        response = requests.get(date_url)
+        response = self.session.get(date_url)
 
         response.raise_for_status()
 
@@ -65,7 +79,7 @@ class ModisClient:
         """
 
         date_url = f"{self.MODIS_API_URL}/{self.product}/subset?latitude={self.latitude}&longitude={self.longitude}&band={band}&startDate={start_date}&endDate={end_date}&kmAboveBelow={km_above_below}&kmLeftRight={km_left_right}"
-        response = requests.get(date_url)
+        response = self.session.get(date_url)
 
         response.raise_for_status()
 
@@ -68,7 +68,16 @@ class ReportClient:
             for visual_container in section["visualContainers"]:
                 try:
                     query_dict = json.loads(visual_container["config"])
-                    for command in query_dict["singleVisual"]["prototypeQuery"]["Select"]:
+                except (KeyError, json.JSONDecodeError):
+                    continue
+
+                # Skip the visuals without a query, such as shapes, images and text boxes.
+                # Slicers do have a query, their fields are extracted like those of the other visuals
+                prototype_query = query_dict.get("singleVisual", {}).get("prototypeQuery")
+                if prototype_query is None:
+                    continue
+                try:
+                    for command in prototype_query["Select"]:
                         if "Measure" in command.keys():
                             # - MEASURES
                             name = command["Name"].split(".")[1]
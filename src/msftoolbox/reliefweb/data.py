@@ -1,17 +1,56 @@
 import requests
+import pandas as pd
 from datetime import datetime
+from msftoolbox._http import new_session
+
+# The keys of the structured reports, also the columns of the DataFrame returned by list_reports
+_REPORT_COLUMNS = ["id", "title", "source_name", "language", "date", "url"]
+
+
+def _report_record(record: dict) -> dict:
+    """Flattens a report of the API response into the structured format returned by list_reports.
+
+    Args:
+        record (dict): A report from the "data" list of the API response.
+
+    Returns:
+        dict: The structured report, keyed by _REPORT_COLUMNS.
+    """
+    fields = record["fields"]
+    return {
+        "id": record["id"],
+        "title": fields["title"],
+        "source_name": " / ".join([source['name'] for source in fields["source"]]),
+        "language": " / ".join([language['name'] for language in fields["language"]]),
+        "date": fields["date"]["original"],
+        "url": record["href"]
+    }
+
 
 class ReliefWebClient():
     """A class that allows to list reports from the Relief Web Updates API,
     loop over the reports and store them to a datalake
 
     """
+
+    REPORTS_API_URL = "https://api.reliefweb.int/v1/reports"
+
+    # The request headers are the same for every call, so they are built once
+    HEADERS = {
+        "Content-Type": "application/json",
+        "Accept": "application/json"  # set the accept header to "application/json"
+    }
+
+    # The fields included in the reports returned by list_reports, a tuple so the callers cannot modify them
+    REPORT_FIELDS = ("source.name", "date", "language.name", "country.iso3")
+
     def __init__(
         self,
         app_name:str = "testing-rwapi",
         preset:str = "latest",
         limit:int = 50,
-        profile:str = "full"
+        profile:str = "full",
+        session:requests.Session = None
         ):
         """Initialises the Relief Web Client
 
@@ -22,12 +61,17 @@ class ReliefWebClient():
                 Defaults to "latest", which sorts by date for appropriate content types. Countries and sources sorted by id.
             limit (int, optional): How many results to return. Defaults to 1000, max 1000.
             profile (str, optional): A shorthand specification for which sets of fields to include in result. Defaults to "full".
+            session (requests.Session, optional): The session used for the requests.
+                Defaults to a new session sharing the connection pools of the toolbox clients.
         """
         self.app_name = app_name
         self.preset = preset
         self.limit = limit
         self.profile = profile
 
+        # A persistent session keeps the connections to the API alive between requests
+        self.session = session if session is not None else new_session()
+
     def try_key(
         self,
         key:str,
@@ -78,7 +122,8 @@ class ReliefWebClient():
         query_operator:str = "OR",
         countries_filter:list = None,
         source_languages_filter:list = "DEFAULT",
-        structured_format:bool = True
+        structured_format:bool = True,
+        as_dataframe:bool = False
         ) -> list:
         """List all reports matching a query with optional filters.
 
@@ -94,6 +139,8 @@ class ReliefWebClient():
             source_languages_filter (list): A list of language codes from ("ot", "ru", "ar", "es", "fr", "en"). Defaults to en.
             structured_format (bool): A predefined structure format that is either true = not nested;
                 false = nested (default = true)
+            as_dataframe (bool): If True, the structured records are returned as a pandas DataFrame
+                with one column per key. Only applies when structured_format is True. Defaults to False.
 
         Returns:
             list: Depending on structured_format.
@@ -105,6 +152,8 @@ class ReliefWebClient():
                 - "language": A string of language names joined by " / ".
                 - "date": The original date of the report.
                 - "url": The URL to access the report.
+            If True and as_dataframe is True:
+            A pandas DataFrame with the same keys as columns.
             If False:
             A list of dictionaries with the API format
 
@@ -157,14 +206,9 @@ class ReliefWebClient():
                     }
                 )
 
-        base_url = f"https://api.reliefweb.int/v1/reports?appname={self.app_name}"
-
-        # set the request headers and body
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json"  # set the accept header to "application/json"
-        }
+        base_url = f"{self.REPORTS_API_URL}?appname={self.app_name}"
 
+        # set the request body
         payload = {
             "preset": self.preset,
             "limit": self.limit,
@@ -174,13 +218,13 @@ class ReliefWebClient():
                 "operator": query_operator
             },
             "filter": all_filters,
-            "fields":{"include":["source.name", "date", "language.name", "country.iso3"]}
+            "fields": {"include": self.REPORT_FIELDS}
         }
 
         # Send request to URL
-        response = requests.post(
+        response = self.session.post(
             base_url,
-            headers=headers,
+            headers=self.HEADERS,
             json=payload
             )
 
@@ -192,19 +236,10 @@ class ReliefWebClient():
 
         if not structured_format:
             return response.json()["data"]
-        else:
-            response_data = response.json()["data"]
-            records = [
-                {
-                    "id": record["id"],
-                    "title": record["fields"]["title"],
-                    "source_name": " / ".join([source['name'] for source in record["fields"]["source"]]),
-                    "language": " / ".join([language['name'] for language in record["fields"]["language"]]),
-                    "date": record["fields"]["date"]["original"],
-                    "url": record["href"]
-                } for record in response_data
-            ]
-            return records
+        records = [_report_record(record) for record in response.json()["data"]]
+        if as_dataframe:
+            return pd.DataFrame(records, columns=_REPORT_COLUMNS)
+        return records
 
 
     def get_report(
@@ -223,7 +258,7 @@ class ReliefWebClient():
         base_url = f"{report_url}?appname={self.app_name}&profile={profile}"
 
         # Send request to URL
-        response = requests.get(
+        response = self.session.get(
             base_url
             )
 
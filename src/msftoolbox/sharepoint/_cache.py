@@ -0,0 +1,163 @@
+"""
+Module holding the in-memory cache of the SharePoint folder listings and existence checks.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Optional
+import posixpath
+import threading
+import time
+from msftoolbox._http import prune_cache
+
+# The maximum number of folder listings and existence checks cached per client
+_FOLDER_CACHE_SIZE = 1024
+
+
+class FolderCache:
+    """
+    Caches the folder listings and existence checks of a SharePointFileClient for ttl seconds,
+    and remembers the folders known to exist for as long.
+
+    The entries are keyed by tuples starting with the normalized URL of their folder. Expired entries
+    are dropped when a value is stored, and the least recently used entries are evicted above
+    _FOLDER_CACHE_SIZE. A ttl of None or 0 disables the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None
+        ):
+        """
+        Initializes an empty cache.
+
+        Args:
+            ttl (Optional[float]): The number of seconds the entries are kept for. Defaults to None, disabling the cache.
+        """
+        self.ttl = ttl
+
+        # Mapping a cache key to its expiry time and its value, least recently used first
+        self._entries = OrderedDict()
+
+        # Normalized URLs of the folders known to exist, mapped to their expiry time like the entries
+        self._known_folders = OrderedDict()
+
+        # Guards both mappings, as folders are listed from several threads
+        self._lock = threading.Lock()
+
+    def get_or_load(
+        self,
+        cache_key: tuple,
+        load: Callable
+        ):
+        """
+        Returns the cached value for a key if it has not expired, else loads and caches it.
+
+        Args:
+            cache_key (tuple): The key of the value, starting with the normalized folder URL.
+            load (Callable): A function loading the value from SharePoint on a cache miss.
+
+        Returns:
+            any: The cached or loaded value.
+        """
+        if not self.ttl:
+            return load()
+
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._entries.move_to_end(cache_key)
+                return cached[1]
+
+        value = load()
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + self.ttl, value)
+            prune_cache(self._entries, _FOLDER_CACHE_SIZE)
+        return value
+
+    def remember_folder(
+        self,
+        folder_url: str
+        ) -> None:
+        """
+        Records that a folder, and therefore all of its parents, exists.
+        Nothing is recorded if the cache is disabled.
+
+        Args:
+            folder_url (str): The server-relative URL of the folder.
+        """
+        if not self.ttl:
+            return
+
+        folder_url = posixpath.normpath(folder_url)
+        expiry = time.monotonic() + self.ttl
+        with self._lock:
+            while folder_url not in ("/", "."):
+                self._known_folders[folder_url] = (expiry, None)
+                self._known_folders.move_to_end(folder_url)
+                folder_url = posixpath.dirname(folder_url)
+            prune_cache(self._known_folders, _FOLDER_CACHE_SIZE)
+
+    def is_known_folder(
+        self,
+        folder_url: str
+        ) -> bool:
+        """
+        Tests whether a folder was remembered to exist and has not expired since.
+
+        Args:
+            folder_url (str): The server-relative URL of the folder.
+
+        Returns:
+            bool: True if the folder is known to exist.
+        """
+        with self._lock:
+            known = self._known_folders.get(posixpath.normpath(folder_url))
+        return known is not None and known[0] > time.monotonic()
+
+    def invalidate(
+        self,
+        path: Optional[str] = None,
+        recursive: bool = False
+        ) -> None:
+        """
+        Removes cached entries.
+
+        Args:
+            path (Optional[str]): The server-relative URL of a folder, or of a file for recursive invalidations.
+                Defaults to None, clearing the whole cache.
+            recursive (bool): If false only removes the listings and existence check of the folder, e.g. after
+                its content changed. If true also removes those of its subfolders, and forgets that the folder
+                and its subfolders exist, e.g. after it was moved or deleted. Defaults to False.
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._known_folders.clear()
+                return
+
+            path = posixpath.normpath(path)
+            if not recursive:
+                for cache_key in [key for key in self._entries if key[0] == path]:
+                    del self._entries[cache_key]
+                return
+
+            for mapping, urls in [
+                    (self._entries, [key for key in self._entries if _is_within(key[0], path)]),
+                    (self._known_folders, [url for url in self._known_folders if _is_within(url, path)])
+                    ]:
+                for url in urls:
+                    del mapping[url]
+
+
+def _is_within(url: str, path: str) -> bool:
+    """
+    Tests whether a normalized URL is a path or one of its descendants.
+
+    Args:
+        url (str): The normalized URL tested.
+        path (str): The normalized URL of the top folder.
+
+    Returns:
+        bool: True if url is path or is under it.
+    """
+    return url == path or url.startswith(path + "/")
@@ -0,0 +1,149 @@
+"""
+Module sending the direct REST requests of the SharePoint client, outside of the office365 client objects.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+from urllib.parse import quote
+import random
+import threading
+import time
+from office365.runtime.http.request_options import RequestOptions
+import requests
+
+
+class RestTransport:
+    """
+    Sends authenticated REST requests to a SharePoint site over a persistent session.
+
+    The number of requests in flight is limited across all threads to stay below the SharePoint
+    throttling limits, and throttled requests are retried.
+    """
+
+    def __init__(
+        self,
+        site_url: str,
+        authentication_context,
+        max_concurrent_requests: int = 8
+        ):
+        """
+        Initializes the transport of a site.
+
+        Args:
+            site_url (str): The URL of the SharePoint site.
+            authentication_context (AuthenticationContext): The authentication context of the client.
+            max_concurrent_requests (int): The maximum number of requests in flight at once. Defaults to 8.
+        """
+        self.site_url = site_url
+        self.authentication_context = authentication_context
+
+        # A persistent session for the direct REST requests, so their connections are kept alive
+        self.session = requests.Session()
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+
+    def close(self) -> None:
+        """
+        Closes the HTTP session and its pooled connections.
+        """
+        self.session.close()
+
+    @contextmanager
+    def send(
+        self,
+        method: str,
+        url: str,
+        max_retries: int = 5,
+        **kwargs
+        ) -> Iterator[requests.Response]:
+        """
+        Sends a direct REST request to SharePoint and yields the response.
+        A request slot is held until the response is consumed, and throttled
+        requests (429 or 503) are retried after the delay asked by SharePoint,
+        else after a jittered exponential backoff. The request slot is released
+        while waiting, so the requests of the other threads carry on in the meantime.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL of the request.
+            max_retries (int): The maximum number of retries of a throttled request. Defaults to 5.
+            **kwargs: Additional arguments passed to requests.Session.request.
+
+        Yields:
+            requests.Response: The response of the request.
+        """
+        for attempt in range(max_retries + 1):
+            self._request_slots.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except BaseException:
+                self._request_slots.release()
+                raise
+
+            if response.status_code not in (429, 503) or attempt == max_retries:
+                break
+
+            # Give the slot back while waiting so the other threads are not held up
+            response.close()
+            self._request_slots.release()
+
+            # Wait for the delay requested by the server, else back off exponentially. The jitter
+            # keeps the threads throttled at the same time from retrying all at once
+            retry_after = response.headers.get("Retry-After", "")
+            delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+            time.sleep(delay + random.uniform(0, 1))
+
+        try:
+            yield response
+        finally:
+            response.close()
+            self._request_slots.release()
+
+    def folder_api_url(
+        self,
+        folder_url: str
+        ) -> str:
+        """
+        Builds the REST URL of a folder.
+
+        Args:
+            folder_url (str): The server-relative URL of the folder.
+
+        Returns:
+            str: The absolute URL of the folder resource.
+        """
+        escaped_url = quote(folder_url.replace("'", "''"))
+        return f"{self.site_url.rstrip('/')}/_api/web/GetFolderByServerRelativeUrl('{escaped_url}')"
+
+    def file_content_url(
+        self,
+        file_url: str
+        ) -> str:
+        """
+        Builds the REST URL returning the raw content of a file.
+
+        Args:
+            file_url (str): The server-relative URL of the file.
+
+        Returns:
+            str: The absolute URL of the file content.
+        """
+        escaped_url = quote(file_url.replace("'", "''"))
+        return f"{self.site_url.rstrip('/')}/_api/web/GetFileByServerRelativeUrl('{escaped_url}')/$value"
+
+    def authenticated_headers(
+        self,
+        url: str
+        ) -> dict:
+        """
+        Returns the headers authenticating a direct REST request to SharePoint,
+        using the same credentials as the client context.
+
+        Args:
+            url (str): The URL of the request.
+
+        Returns:
+            dict: The request headers.
+        """
+        request = RequestOptions(url)
+        self.authentication_context.authenticate_request(request)
+        return request.headers
@@ -1,8 +1,93 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from office365.runtime.auth.user_credential import UserCredential
 from office365.runtime.auth.client_credential import ClientCredential
+from office365.runtime.client_request_exception import ClientRequestException
+from office365.runtime.odata.type import ODataType
 from office365.sharepoint.client_context import ClientContext
+from operator import itemgetter
+import copy
+import hashlib
 import os
+import posixpath
+import threading
+import requests
+from msftoolbox.sharepoint._cache import FolderCache
+from msftoolbox.sharepoint._transport import RestTransport
+
+# Authentication contexts shared by all clients of the process, keyed by a hash of the site and credentials,
+# so that the authentication round trip is only paid once per site and account
+_AUTH_CACHE = {}
+_AUTH_CACHE_LOCK = threading.Lock()
+
+# The properties kept for files and folders when keep_metadata is False
+_RECORD_FIELDS = ["Name", "ServerRelativeUrl", "TimeLastModified"]
+_get_record_fields = itemgetter(*_RECORD_FIELDS)
+
+
+def _auth_cache_key(site_url: str, *credentials: str) -> str:
+    """
+    Builds the key of an authentication context in _AUTH_CACHE.
+    The credentials are hashed so the cache does not hold them in plain text.
+
+    Args:
+        site_url (str): The URL of the SharePoint site.
+        *credentials (str): The username and password, or the client ID and secret.
+
+    Returns:
+        str: The SHA-256 digest of the site URL and the credentials.
+    """
+    return hashlib.sha256("\0".join((site_url, *credentials)).encode("utf-8")).hexdigest()
+
+
+def clear_authentication_cache() -> None:
+    """
+    Removes the authentication contexts shared by the clients, so that the clients created
+    afterwards authenticate again. Existing clients keep using their authentication context.
+    """
+    with _AUTH_CACHE_LOCK:
+        _AUTH_CACHE.clear()
+
+
+# The size above which files are uploaded in chunks, as single requests are capped by SharePoint
+_MAX_SIMPLE_UPLOAD_SIZE = 4 * 1024 * 1024
+
+
+def _to_record(properties: dict, keep_metadata: bool) -> dict:
+    """
+    Converts the properties of a SharePoint file or folder to the record returned by the listing methods.
+
+    Args:
+        properties (dict): The properties of the file or folder.
+        keep_metadata (bool): If true returns the full properties object, else only the record fields.
+
+    Returns:
+        dict: The file or folder record.
+    """
+    # If the keep_metadata attribute is True then keep
+    # all properties else subset for commonly used ones
+    if keep_metadata:
+        return properties
+    return dict(zip(_RECORD_FIELDS, _get_record_fields(properties)))
+
+
+def _unseen(folder_urls, seen: set) -> Iterator[str]:
+    """
+    Yields the normalized folder URLs that are not in seen yet, and adds them to it.
+
+    Args:
+        folder_urls (Iterable[str]): The server-relative URLs of the folders.
+        seen (set): The normalized URLs of the folders already queued.
+
+    Yields:
+        str: A normalized folder URL.
+    """
+    for folder_url in folder_urls:
+        folder_url = posixpath.normpath(folder_url)
+        if folder_url not in seen:
+            seen.add(folder_url)
+            yield folder_url
+
 
 class SharePointFileClient:
     """
@@ -18,7 +103,9 @@ class SharePointFileClient:
         username: Optional[str] = None,
         password: Optional[str] = None,
         client_id: Optional[str] = None,
-        client_secret: Optional[str] = None
+        client_secret: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        max_concurrent_requests: int = 8
         ):
         """
         Initializes the SharePointClient with site URL and user credentials.
@@ -29,19 +116,140 @@ class SharePointFileClient:
             password (Optional[str]): The password for authentication.
             client_id (Optional[str]): The client ID for app authentication.
             client_secret (Optional[str]): The client secret for app authentication.
+            cache_ttl (Optional[float]): The number of seconds folder listings and existence checks are cached for.
+                Defaults to None, which disables the cache.
+            max_concurrent_requests (int): The maximum number of direct REST requests in flight at once,
+                across all threads, to stay below the SharePoint throttling limits. Defaults to 8.
         """
         self.site_url = site_url
 
         if username and password:
             self.credentials = UserCredential(username, password)
+            cache_key = _auth_cache_key(site_url, username, password)
         elif client_id and client_secret:
             self.credentials = ClientCredential(client_id, client_secret)
+            cache_key = _auth_cache_key(site_url, client_id, client_secret)
         else:
             raise ValueError("Either username/password or client_id/client_secret must be provided.")
 
-        self.context = ClientContext(
-            site_url
-            ).with_credentials(self.credentials)
+        # Reuse the authentication context of a previous client with the same credentials
+        self._auth_cache_key = cache_key
+        with _AUTH_CACHE_LOCK:
+            if cache_key not in _AUTH_CACHE:
+                _AUTH_CACHE[cache_key] = ClientContext(
+                    site_url
+                    ).with_credentials(self.credentials).authentication_context
+            self.authentication_context = _AUTH_CACHE[cache_key]
+
+        # ClientContext is not thread-safe, so each thread gets its own context
+        self._thread_local = threading.local()
+
+        # The cached folder listings and existence checks, and the folders known to exist
+        # so create_folder_if_not_exists can skip SharePoint
+        self._folder_cache = FolderCache(cache_ttl)
+
+        # The direct REST requests, sent outside of the client objects
+        self._transport = RestTransport(site_url, self.authentication_context, max_concurrent_requests)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the HTTP session of the client and its pooled connections.
+        """
+        self._transport.close()
+
+    def forget_authentication(self) -> None:
+        """
+        Removes the authentication context of the client's credentials from the cache shared by the clients,
+        e.g. after the credentials were revoked. The clients created afterwards authenticate again.
+        """
+        with _AUTH_CACHE_LOCK:
+            _AUTH_CACHE.pop(self._auth_cache_key, None)
+
+    def invalidate(
+        self,
+        path: Optional[str] = None,
+        recursive: bool = False
+        ) -> None:
+        """
+        Removes cached folder listings and existence checks, e.g. after changes made outside of the client.
+
+        Args:
+            path (Optional[str]): The server-relative URL of a folder. Defaults to None, clearing the whole cache.
+            recursive (bool): If false only removes the listings and existence check of the folder, e.g. after
+                its content changed. If true also removes those of its subfolders, and forgets that the folder
+                and its subfolders exist, e.g. after it was moved or deleted. Defaults to False.
+        """
+        self._folder_cache.invalidate(path, recursive)
+
+    @property
+    def context(self) -> ClientContext:
+        """
+        The ClientContext of the calling thread, created on first access.
+        All contexts share the cached authentication context of the client.
+
+        Returns:
+            ClientContext: An authenticated client context.
+        """
+        context = getattr(self._thread_local, "context", None)
+        if context is None:
+            context = ClientContext(
+                self.site_url,
+                self.authentication_context
+                )
+            self._thread_local.context = context
+        return context
+
+    def iter_files_in_folder(
+        self,
+        folder_url: str,
+        keep_metadata: bool = False,
+        page_size: int = 1000
+        ) -> Iterator[dict]:
+        """
+        Lazily iterates over the files in a specified folder.
+        The files are requested from SharePoint in pages, so only one page is
+        fetched at a time and callers that stop early do not load the full folder.
+
+        The Files collection of a folder ignores $skip and returns no link to its next page,
+        so the files are paged through the list items of the folder, which SharePoint pages
+        with $skiptoken, and the file of each item is expanded.
+
+        Args:
+            folder_url (str): The server-relative URL of the folder.
+            keep_metadata (bool): If false returns only the name and server url, else the full properties object.
+                See list_files_in_folder for the available properties.
+            page_size (int): The number of files requested per page. Defaults to 1000.
+
+        Yields:
+            dict: A file record, or its full properties if keep_metadata is true.
+        """
+        # Get the folder
+        folder = self.context.web.get_folder_by_server_relative_url(
+            folder_url
+            )
+
+        # Page through the items of the folder in its document library, skipping the subfolders,
+        # and only request the needed properties of the files if the metadata is not kept
+        escaped_url = posixpath.normpath(folder_url).replace("'", "''")
+        items = (
+            folder.list_item_all_fields.parent_list.items.get()
+            .filter(f"FileDirRef eq '{escaped_url}' and FSObjType eq 0")
+            .expand(["File"])
+            .paged(page_size)
+            )
+        if not keep_metadata:
+            items = items.select([f"File/{field}" for field in _RECORD_FIELDS])
+        self.context.execute_query_with_incremental_retry()
+
+        # The following pages are requested while iterating
+        for item in items:
+            yield _to_record(item.file.properties, keep_metadata)
 
     def list_files_in_folder(
         self,
@@ -61,33 +269,7 @@ class SharePointFileClient:
         Returns:
             List[dict]: A list of file records in the folder.
         """
-        # Get the folder
-        folder = self.context.web.get_folder_by_server_relative_url(
-            folder_url
-            )
-
-        # List the files in the folder
-        files = folder.files
-        self.context.load(files)
-        self.context.execute_query_with_incremental_retry()
-
-        # If the keep_metadata attribute is True then keep
-        # all properties else subset for commonly used ones
-        if keep_metadata:
-            records = [
-                file.properties for file in files
-                ]
-        else:
-            records = [{
-                field: file.properties[field]
-                for field in [
-                    "Name",
-                    "ServerRelativeUrl",
-                    "TimeLastModified"
-                    ]
-                } for file in files]
-
-        return records
+        return self._list_folder_contents(folder_url, ["Files"], keep_metadata)["Files"]
 
 
     def list_folders_in_folder(
@@ -96,7 +278,7 @@ class SharePointFileClient:
         keep_metadata: bool = False
         ) -> List[str]:
         """
-        Lists all files in a specified folder.
+        Lists all folders in a specified folder.
 
         Args:
             folder_url (str): The server-relative URL of the folder.
@@ -107,191 +289,390 @@ class SharePointFileClient:
         Returns:
             List[dict]: A list of folder records in the folder.
         """
-        # Get the folder
-        folder = self.context.web.get_folder_by_server_relative_url(
-            folder_url
-            )
+        return self._list_folder_contents(folder_url, ["Folders"], keep_metadata)["Folders"]
 
-        # List folders in the folder
-        folders = folder.folders
-        self.context.load(folders)
-        self.context.execute_query_with_incremental_retry()
+    def _list_folder_contents(
+        self,
+        folder_url: str,
+        collections: List[str],
+        keep_metadata: bool = False
+        ) -> Dict[str, List[dict]]:
+        """
+        Lists the subfolders and/or the files of a folder in a single request, by expanding only the
+        requested collections of the folder. The listing is cached, see the cache_ttl argument of the client.
 
-        # If the keep_metadata attribute is True then keep
-        # all properties else subset for commonly used ones
-        if keep_metadata:
-            records = [
-                folder.properties for folder in folders
-                ]
-        else:
-            records = [{
-                field: folder.properties[field]
-                for field in [
-                    "Name",
-                    "ServerRelativeUrl",
-                    "TimeLastModified"
-                    ]
-                } for folder in folders]
+        Args:
+            folder_url (str): The server-relative URL of the folder.
+            collections (List[str]): The collections to list, "Folders" and/or "Files".
+            keep_metadata (bool): If false returns only the name and server url, else the full properties object.
+
+        Returns:
+            Dict[str, List[dict]]: The records of each requested collection.
+        """
+        def load():
+            if keep_metadata:
+                # The full properties are loaded by the client objects, so they keep the same shape
+                # as the properties returned by the other methods of the client
+                folder = self.context.web.get_folder_by_server_relative_url(folder_url)
+                folder.expand(collections).select(collections).get()
+                self.context.execute_query_with_incremental_retry()
+                return {
+                    collection: [item.properties for item in folder.get_property(collection)]
+                    for collection in collections
+                    }
+
+            # The records are requested directly without OData metadata, which keeps large
+            # responses small and avoids building a client object per file and folder
+            url = self._transport.folder_api_url(folder_url)
+            params = {
+                "$expand": ",".join(collections),
+                "$select": ",".join(
+                    f"{collection}/{field}"
+                    for collection in collections
+                    for field in _RECORD_FIELDS
+                    )
+                }
+            headers = self._transport.authenticated_headers(url)
+            headers["Accept"] = "application/json;odata=nometadata"
+
+            with self._transport.send("GET", url, params=params, headers=headers) as response:
+                response.raise_for_status()
+                folder = response.json()
+
+            # The modification times are parsed like the client objects do
+            records = {}
+            for collection in collections:
+                records[collection] = [_to_record(item, False) for item in folder[collection]]
+                for record in records[collection]:
+                    record["TimeLastModified"] = ODataType.try_parse_datetime(record["TimeLastModified"])
+            return records
+
+        records = self._folder_cache.get_or_load(
+            (posixpath.normpath(folder_url), "contents", tuple(collections), keep_metadata),
+            load
+            )
+
+        for subfolder in records.get("Folders", []):
+            self._folder_cache.remember_folder(subfolder["ServerRelativeUrl"])
+        self._folder_cache.remember_folder(folder_url)
 
+        # The cached listing is shared by all calls, so each caller gets its own copy to modify
+        if self._folder_cache.ttl:
+            records = copy.deepcopy(records)
         return records
 
     def download_file(
         self,
         source_url: str,
-        destination_file_path: str
+        destination_file_path: str,
+        chunk_size: int = 1024 * 1024
         ) -> None:
         """
         Downloads a file from SharePoint.
+        The file content is streamed to disk in chunks so memory usage does not grow with the file size.
 
         Args:
             source_url (str): The server-relative URL of the file.
-            local_file_path (str): The local path where the file will be saved.
+            destination_file_path (str): The local path where the file will be saved.
+            chunk_size (int): The number of bytes written per chunk. Defaults to 1MB.
         """
-        # Get the file
-        file = self.context.web.get_file_by_server_relative_url(
-            source_url
+        content_url = self._transport.file_content_url(source_url)
+        headers = self._transport.authenticated_headers(content_url)
+
+        # Stream the file content to the local file path chunk by chunk
+        with self._transport.send("GET", content_url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            with open(destination_file_path, "wb") as local_file:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    local_file.write(chunk)
+
+        print(f"Downloaded: {destination_file_path}")
+        return None
+
+    def download_files(
+        self,
+        files: List[Union[str, Tuple[str, str]]],
+        download_dir: Optional[str] = None,
+        max_workers: int = 8
+        ) -> List[str]:
+        """
+        Downloads several files from SharePoint concurrently.
+        Each worker thread uses its own ClientContext, as contexts are not thread-safe.
+
+        Args:
+            files (List[Union[str, Tuple[str, str]]]): The files to download. Either server-relative URLs,
+                saved in download_dir under their SharePoint name, or (source_url, destination_file_path) pairs.
+            download_dir (Optional[str]): The local directory where files given as URLs will be saved.
+            max_workers (int): The maximum number of parallel downloads. Defaults to 8.
+
+        Returns:
+            List[str]: The local paths of the downloaded files, in the order of files.
+        """
+        source_urls = []
+        destination_file_paths = []
+        for file in files:
+            if isinstance(file, str):
+                if download_dir is None:
+                    raise ValueError("download_dir must be provided when files are given as URLs.")
+                source_urls.append(file)
+                destination_file_paths.append(
+                    os.path.join(download_dir, posixpath.basename(file))
+                    )
+            else:
+                source_url, destination_file_path = file
+                source_urls.append(source_url)
+                destination_file_paths.append(destination_file_path)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the results so that errors in a worker are raised here
+            list(executor.map(
+                self.download_file,
+                source_urls,
+                destination_file_paths
+                ))
+
+        return destination_file_paths
+
+    def download_file_multipart(
+        self,
+        source_url: str,
+        destination_file_path: str,
+        parts: int = 8,
+        chunk_size: int = 1024 * 1024
+        ) -> None:
+        """
+        Downloads a large file from SharePoint with several concurrent ranged requests.
+        Each part is written straight to its offset in the destination file,
+        which speeds up downloads limited by the throughput of a single connection.
+
+        Args:
+            source_url (str): The server-relative URL of the file.
+            destination_file_path (str): The local path where the file will be saved.
+            parts (int): The number of ranges downloaded in parallel. Defaults to 8.
+            chunk_size (int): The number of bytes written per chunk. Defaults to 1MB.
+        """
+        # Get the size of the file
+        file = (
+            self.context.web.get_file_by_server_relative_url(source_url)
+            .get()
+            .select(["Length"])
+            .execute_query_with_incremental_retry()
             )
+        length = int(file.properties["Length"])
 
-        self.context.load(file)
-        self.context.execute_query_with_incremental_retry()
+        # Authenticate once and share the headers between the parts
+        content_url = self._transport.file_content_url(source_url)
+        headers = self._transport.authenticated_headers(content_url)
 
-        # Load the file to the local file path
+        # Allocate the destination file so each part can be written at its offset
         with open(destination_file_path, "wb") as local_file:
-            file.download(
-                local_file
-                ).execute_query_with_incremental_retry()
+            local_file.truncate(length)
+
+        part_size = -(-length // max(parts, 1))
+        ranges = [
+            (start, min(start + part_size, length) - 1)
+            for start in range(0, length, part_size)
+            ] if length else []
+
+        with ThreadPoolExecutor(max_workers=max(parts, 1)) as executor:
+            # Consume the results so that errors in a worker are raised here
+            list(executor.map(
+                lambda byte_range: self._download_range(
+                    content_url,
+                    headers,
+                    destination_file_path,
+                    byte_range,
+                    chunk_size
+                    ),
+                ranges
+                ))
 
         print(f"Downloaded: {destination_file_path}")
         return None
 
+    def _download_range(
+        self,
+        content_url: str,
+        headers: dict,
+        destination_file_path: str,
+        byte_range: Tuple[int, int],
+        chunk_size: int
+        ) -> None:
+        """
+        Downloads a byte range of a file and writes it at the same offset of the local file.
+
+        Args:
+            content_url (str): The REST URL of the file content.
+            headers (dict): The authenticated request headers.
+            destination_file_path (str): The local path of the preallocated file.
+            byte_range (Tuple[int, int]): The first and last byte of the range, both inclusive.
+            chunk_size (int): The number of bytes written per chunk.
+        """
+        start, end = byte_range
+        range_headers = {**headers, "Range": f"bytes={start}-{end}"}
+
+        with self._transport.send("GET", content_url, headers=range_headers, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise requests.HTTPError(
+                    f"Expected a partial content response for the range {start}-{end}, "
+                    f"received: {response.status_code}"
+                    )
+
+            with open(destination_file_path, "r+b") as local_file:
+                local_file.seek(start)
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    local_file.write(chunk)
+
     def upload_file(
         self,
         source_file_path: str,
-        destination_url: str
+        destination_url: str,
+        chunk_size: int = 10 * 1024 * 1024
         ) -> None:
         """
         Uploads a file to the sharepoint folder.
-        Files up to 4MB are accepted.
+        Files up to 4MB are sent in a single request, larger files are streamed
+        from disk in an upload session so memory usage does not grow with the file size.
 
         Args:
             source_file_path (str): The local path of the file too upload.
             destination_url (str): The server-relative URL of the folder destination.
-        """
-        # Open the file and store the content
-        with open(source_file_path, "rb") as content_file:
-            file_content = content_file.read()
+            chunk_size (int): The number of bytes sent per request for files above 4MB. Defaults to 10MB.
 
-        folder_exists = self.test_folder_existence(
+        Raises:
+            Exception: If the destination folder does not exist.
+        """
+        # Get the Sharepoint target folder, its existence is checked by the upload itself
+        target_folder = self.context.web.get_folder_by_server_relative_url(
             destination_url
             )
 
-        if not folder_exists:
-            raise Exception("The destination folder does not exist")
-        else:
-            # Get the Sharepoint target folder
-            target_folder = self.context.web.get_folder_by_server_relative_url(
-                destination_url
-                )
-            target_folder.get()
-            target_folder.execute_query_with_incremental_retry()
-
-            # Get the file name based on the source name
-            name = os.path.basename(
-                source_file_path
-                )
-
-            # Upload
-            target_folder.upload_file(
-                name,
-                file_content
-                ).execute_query_with_incremental_retry()
+        # Get the file name based on the source name
+        name = os.path.basename(
+            source_file_path
+            )
 
-            return None
+        try:
+            if os.path.getsize(source_file_path) <= _MAX_SIMPLE_UPLOAD_SIZE:
+                # Open the file and store the content
+                with open(source_file_path, "rb") as content_file:
+                    file_content = content_file.read()
+
+                # Upload
+                target_folder.upload_file(
+                    name,
+                    file_content
+                    ).execute_query_with_incremental_retry()
+            else:
+                # Upload chunk by chunk with StartUpload, ContinueUpload and FinishUpload
+                target_folder.files.create_upload_session(
+                    source_file_path,
+                    chunk_size
+                    ).execute_query_with_incremental_retry()
+        except ClientRequestException as e:
+            if e.response is not None and e.response.status_code == 404:
+                self.invalidate(destination_url, recursive=True)
+                raise Exception("The destination folder does not exist") from e
+            raise
+
+        self._folder_cache.remember_folder(destination_url)
+        self.invalidate(destination_url)
+        return None
 
     def recursively_list_files(
         self,
-        folder_url: str,
-        keep_metadata: bool = False
+        folder_url: Union[str, List[str]],
+        keep_metadata: bool = False,
+        max_workers: int = 8
         ) -> List[str]:
         """
         Recursively expands folders and lists all files.
+        Subfolders are listed concurrently as soon as their parent has been listed,
+        so the number of sequential round trips grows with the depth of the tree rather than its size.
 
         Args:
-            folder_url (str): The server-relative URL of the starting folder.
+            folder_url (Union[str, List[str]]): The server-relative URL of the starting folder, or a list of them.
+                Each folder is listed once, even when the starting folders overlap.
             keep_metadata (bool): If false returns only the server url, else the full properties object
                 'CheckInComment', 'CheckOutType', 'ContentTag', 'CustomizedPageStatus', 'ETag', 'Exists',
                 'ExistsAllowThrowForPolicyFailures', 'ExistsWithException', 'IrmEnabled', 'Length', 'Level',
                 'LinkingUri', 'LinkingUrl', 'MajorVersion', 'MinorVersion', 'Name', 'ServerRelativeUrl',
                 'TimeCreated', 'TimeLastModified', 'Title', 'UIVersion', 'UIVersionLabel', 'UniqueId'
+            max_workers (int): The maximum number of folders listed in parallel. Defaults to 8.
 
         Returns:
             List[str]: A list of all file names in the folder and its subfolders.
         """
-        # Get the folders in the root folder
-        folders = self.list_folders_in_folder(
-            folder_url
-            )
-
-        # Get all the files in the folder
         all_files = []
-        for subfolder in folders:
-            subfolder_url = subfolder["ServerRelativeUrl"]
-            all_files.extend(
-                self.recursively_list_files(
-                    subfolder_url,
-                    keep_metadata
-                    )
-                )
-
-        all_files.extend(
-            self.list_files_in_folder(
-                folder_url,
-                keep_metadata
-                )
-            )
+        folder_urls = [folder_url] if isinstance(folder_url, str) else folder_url
+        seen = set()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Each pending listing returns the subfolders and the files of a folder in a single request
+            pending = {
+                executor.submit(self._list_folder_contents, url, ["Folders", "Files"], keep_metadata)
+                for url in _unseen(folder_urls, seen)
+                }
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                # Queue the subfolders of the listed folders without waiting for their siblings
+                for future in done:
+                    records = future.result()
+                    all_files.extend(records["Files"])
+                    pending.update(
+                        executor.submit(self._list_folder_contents, url, ["Folders", "Files"], keep_metadata)
+                        for url in _unseen((subfolder["ServerRelativeUrl"] for subfolder in records["Folders"]), seen)
+                        )
 
         return all_files
 
 
     def recursively_list_folders(
         self,
-        folder_url: str,
-        keep_metadata: bool = False
+        folder_url: Union[str, List[str]],
+        keep_metadata: bool = False,
+        max_workers: int = 8
         ) -> List[str]:
         """
-        Recursively expands folders and lists all files.
+        Recursively expands folders and lists all folders.
+        Subfolders are listed concurrently as soon as their parent has been listed,
+        so the number of sequential round trips grows with the depth of the tree rather than its size.
 
         Args:
-            folder_url (str): The server-relative URL of the starting folder.
+            folder_url (Union[str, List[str]]): The server-relative URL of the starting folder, or a list of them.
+                Each folder is listed once, even when the starting folders overlap.
             keep_metadata (bool): If false returns only the server url, else the full properties object:
                 'Exists', 'ExistsAllowThrowForPolicyFailures', 'ExistsWithException', 'IsWOPIEnabled', 'ItemCount', 'Name',
                 'ProgID', 'ServerRelativeUrl', 'TimeCreated', 'TimeLastModified', 'UniqueId', 'WelcomePage'
+            max_workers (int): The maximum number of folders listed in parallel. Defaults to 8.
 
         Returns:
-            List[str]: A list of all file names in the folder and its subfolders.
+            List[str]: A list of all folders in the folder and its subfolders.
         """
-        # Get the folders in the root folder
-        folders = self.list_folders_in_folder(
-            folder_url
-            )
-
-        # Get all the files in the folder
         all_folders = []
-        for subfolder in folders:
-            subfolder_url = subfolder["ServerRelativeUrl"]
-            all_folders.extend(
-                self.recursively_list_folders(
-                    subfolder_url,
-                    keep_metadata
-                    )
-                )
-
-        all_folders.extend(
-            self.list_folders_in_folder(
-                folder_url,
-                keep_metadata
-                )
-            )
+        folder_urls = [folder_url] if isinstance(folder_url, str) else folder_url
+        seen = set()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {
+                executor.submit(self.list_folders_in_folder, url, keep_metadata)
+                for url in _unseen(folder_urls, seen)
+                }
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                # Queue the subfolders of the listed folders without waiting for their siblings
+                for future in done:
+                    folders = future.result()
+                    all_folders.extend(folders)
+                    pending.update(
+                        executor.submit(self.list_folders_in_folder, url, keep_metadata)
+                        for url in _unseen((subfolder["ServerRelativeUrl"] for subfolder in folders), seen)
+                        )
 
         return all_folders
 
@@ -317,6 +698,10 @@ class SharePointFileClient:
 
         file.moveto(destination_folder_url, int(overwrite))
         self.context.execute_query_with_incremental_retry()
+
+        self.invalidate(source_file_url, recursive=True)
+        self.invalidate(posixpath.dirname(source_file_url))
+        self.invalidate(destination_folder_url)
         return None
 
     def rename_file(
@@ -340,6 +725,7 @@ class SharePointFileClient:
         file.rename(new_file_name)
         self.context.execute_query_with_incremental_retry()
 
+        self.invalidate(posixpath.dirname(file_url))
         return None
 
     def recycle_file(
@@ -359,6 +745,84 @@ class SharePointFileClient:
         file.recycle()
         self.context.execute_query_with_incremental_retry()
 
+        self.invalidate(file_url, recursive=True)
+        self.invalidate(posixpath.dirname(file_url))
+        return None
+
+    def move_files(
+        self,
+        moves: List[Tuple[str, str]],
+        overwrite: bool = False,
+        batch_size: int = 100
+        ) -> None:
+        """
+        Moves several files to their destination folder, sending the moves in batch requests.
+        Important: The destination folder urls should not include the name.
+
+        Args:
+            moves (List[Tuple[str, str]]): The server-relative URLs of the files and of their destination folder.
+            overwrite (bool): Determines the behaviour if a file is at the specified destination.
+            batch_size (int): The number of moves sent per request, SharePoint accepts up to 100. Defaults to 100.
+        """
+        for source_file_url, destination_folder_url in moves:
+            self.context.web.get_file_by_server_relative_url(
+                source_file_url
+                ).moveto(destination_folder_url, int(overwrite))
+        self.context.execute_batch(batch_size)
+
+        for source_file_url, destination_folder_url in moves:
+            self.invalidate(source_file_url, recursive=True)
+            self.invalidate(posixpath.dirname(source_file_url))
+            self.invalidate(destination_folder_url)
+        return None
+
+    def rename_files(
+        self,
+        renames: List[Tuple[str, str]],
+        batch_size: int = 100
+        ) -> None:
+        """
+        Renames several files, sending the renames in batch requests.
+
+        Args:
+            renames (List[Tuple[str, str]]): The server-relative URLs of the files and their new name without the path.
+            batch_size (int): The number of renames sent per request, SharePoint accepts up to 100. Defaults to 100.
+        """
+        for _, new_file_name in renames:
+            if os.path.basename(new_file_name) != new_file_name:
+                raise ValueError("new_file_name should not contain a path.")
+
+        for file_url, new_file_name in renames:
+            self.context.web.get_file_by_server_relative_url(
+                file_url
+                ).rename(new_file_name)
+        self.context.execute_batch(batch_size)
+
+        for file_url, _ in renames:
+            self.invalidate(posixpath.dirname(file_url))
+        return None
+
+    def recycle_files(
+        self,
+        file_urls: List[str],
+        batch_size: int = 100
+        ) -> None:
+        """
+        Places several files in the recycle bin, sending the requests in batches.
+
+        Args:
+            file_urls (List[str]): The server-relative URLs of the files.
+            batch_size (int): The number of files recycled per request, SharePoint accepts up to 100. Defaults to 100.
+        """
+        for file_url in file_urls:
+            self.context.web.get_file_by_server_relative_url(
+                file_url
+                ).recycle()
+        self.context.execute_batch(batch_size)
+
+        for file_url in file_urls:
+            self.invalidate(file_url, recursive=True)
+            self.invalidate(posixpath.dirname(file_url))
         return None
 
     def create_folder_if_not_exists(
@@ -366,6 +830,7 @@ class SharePointFileClient:
         folder_url
         ):
         """Creates a folder if it does not exist at the specified server-relative URL.
+        Missing parent folders are created as well, in a single request.
 
         Args:
             folder_url (str): The server-relative URL of the starting folder.
@@ -373,20 +838,26 @@ class SharePointFileClient:
         Returns:
             str: The server-relative URL of the starting folder.
         """
-        folder_test = self.test_folder_existence(folder_url)
+        # Folders created or listed earlier by this client do not need to be checked again until they expire
+        if self._folder_cache.is_known_folder(folder_url):
+            return posixpath.normpath(folder_url)
 
-        if folder_test:
-            print("Folder exits already.")
-        else:
-            print("Creating folder.")
+        # ensure_folder_path is idempotent, so the folder is not tested for existence first
+        folder = (
+            self.context.web.ensure_folder_path(folder_url)
+            .get()
+            .select(["ServerRelativeUrl"])
+            .execute_query_with_incremental_retry()
+        )
 
-            folder_test = (
-                self.context.web.ensure_folder_path(folder_url)
-                .get()
-                .select(["ServerRelativePath"])
-                .execute_query_with_incremental_retry()
-            )
-        return None
+        # Any of the parent folders may have been created as well
+        parent_url = posixpath.normpath(folder_url)
+        while parent_url not in ("/", "."):
+            self.invalidate(parent_url)
+            parent_url = posixpath.dirname(parent_url)
+
+        self._folder_cache.remember_folder(folder_url)
+        return folder.properties.get("ServerRelativeUrl", folder_url)
 
 
     def test_folder_existence(
@@ -401,11 +872,15 @@ class SharePointFileClient:
         Returns:
             str: The server-relative URL of the starting folder.
         """
-        folder_test = (
-            self.context.web.get_folder_by_server_relative_path(folder_url)
-            .get()
-            .execute_query_with_incremental_retry()
-            )
+        def load():
+            folder_test = (
+                self.context.web.get_folder_by_server_relative_path(folder_url)
+                .get()
+                .execute_query_with_incremental_retry()
+                )
+            return folder_test.properties.get("Exists", False)
 
-        folder_test = folder_test.properties.get("Exists", False)
-        return folder_test
\ No newline at end of file
+        return self._folder_cache.get_or_load(
+            (posixpath.normpath(folder_url), "exists"),
+            load
+            )
\ No newline at end of file
@@ -1,5 +1,55 @@
+import functools
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from urllib.error import HTTPError
+from msftoolbox._http import new_session, json_loads, prune_cache
+
+# The number of responses kept for conditional requests
+_ETAG_CACHE_SIZE = 256
+
+# The rarely-changing catalogue endpoints requested conditionally. The pages of articles are left out,
+# as iterating over them would fill the cache with responses that are not requested again
+_CONDITIONAL_ENDPOINTS = ('/lists', '/intros', '/checklists')
+
+# The number of method results kept by the cached methods
+_API_CACHE_SIZE = 256
+
+
+def _cached_api(method):
+    """
+    Caches the response body returned by a client method for cache_ttl seconds, per query parameters,
+    and returns the parsed data. The body is cached rather than the data and parsed on every call,
+    so callers get their own copy and can modify it freely. Expired entries are dropped when a value
+    is stored, and the least recently used entries are evicted above _API_CACHE_SIZE.
+
+    Args:
+        method (Callable): The client method to cache, only taking keyword arguments and returning a JSON body.
+
+    Returns:
+        Callable: The cached method.
+    """
+    @functools.wraps(method)
+    def wrapper(self, **kwargs):
+        if not self.cache_ttl:
+            return json_loads(method(self, **kwargs))
+
+        cache_key = (method.__name__, repr(sorted(kwargs.items())))
+        with self._cache_lock:
+            cached = self._api_cache.get(cache_key)
+            if cached is not None and time.monotonic() < cached[0]:
+                self._api_cache.move_to_end(cache_key)
+                return json_loads(cached[1])
+
+        content = method(self, **kwargs)
+        with self._cache_lock:
+            self._api_cache[cache_key] = (time.monotonic() + self.cache_ttl, content)
+            prune_cache(self._api_cache, _API_CACHE_SIZE)
+        return json_loads(content)
+    return wrapper
+
 
 class UniDataAPIClient:
     """
@@ -14,7 +64,9 @@ class UniDataAPIClient:
         username:str,
         password:str,
         server_url:str,
-        timeout=10
+        timeout=10,
+        cache_ttl:float=None,
+        session:requests.Session=None
         ):
         """
         Initializes the UniDataAPIClient instance with optional UniData server credentials and URL.
@@ -24,12 +76,44 @@ class UniDataAPIClient:
             password (str): UniData password.
             server_url (str): UniData server URL.
             timeout (int, optional): Default timeout for requests in seconds. Defaults to 10.
+            cache_ttl (float, optional): The number of seconds the articles, subcatalogues, intros and
+                checklists are cached for. Defaults to None, disabling the cache.
+            session (requests.Session, optional): The session used for the requests.
+                Defaults to a new session sharing the connection pools of the toolbox clients.
         """
         self.username = username
         self.password = password
         self.server_url = server_url
         self.timeout = timeout
 
+        # A persistent session keeps the connections to the server alive between requests,
+        # and retries the requests failing on transient gateway errors
+        self.session = session if session is not None else new_session()
+
+        # The ETag and body of the last responses per URL and parameters, least recently used first
+        self._etag_cache = OrderedDict()
+
+        # The response bodies of the cached methods, mapping a method and its parameters to an expiry time and the body,
+        # least recently used first
+        self.cache_ttl = cache_ttl
+        self._api_cache = OrderedDict()
+
+        # Guards both caches, as pages of articles may be requested from several threads
+        self._cache_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases the client at the end of a with block.
+        The session is left open, as its connection pools are either shared by the clients of the toolbox
+        or provided by the caller, who remains responsible for closing them.
+        """
+
     def configure_unidata_server(
         self,
         username:str,
@@ -53,6 +137,28 @@ class UniDataAPIClient:
         if server_url is not None:
             self.server_url = server_url
 
+        # The cached data and the responses kept for conditional requests may come from another server or account
+        self.invalidate_cache()
+
+    def invalidate_cache(
+        self,
+        method_name:str=None
+        ):
+        """
+        Removes the cached data of a method, or of all methods along with the responses kept for conditional requests.
+
+        Args:
+            method_name (str, optional): The name of the cached method, e.g. 'get_articles'.
+                Defaults to None, clearing the whole cache.
+        """
+        with self._cache_lock:
+            if method_name is None:
+                self._api_cache.clear()
+                self._etag_cache.clear()
+            else:
+                for cache_key in [key for key in self._api_cache if key[0] == method_name]:
+                    del self._api_cache[cache_key]
+
     def get_response(
         self,
         endpoint:str,
@@ -61,6 +167,8 @@ class UniDataAPIClient:
         ):
         """
         Makes an authenticated GET request to the specified endpoint and returns the JSON response.
+        Responses of the catalogue endpoints carrying an ETag are kept, and the following requests with
+        the same parameters are made conditional so an unchanged response is not downloaded again.
 
         Args:
             endpoint (str): The API endpoint to send the GET request to.
@@ -74,14 +182,45 @@ class UniDataAPIClient:
             ValueError: If authentication fails.
             HTTPError: For other HTTP errors.
         """
+        return json_loads(self._get_content(endpoint, params=params, timeout=timeout))
+
+    def _get_content(
+        self,
+        endpoint:str,
+        params:dict=None,
+        timeout:int=None
+        ) -> bytes:
+        """
+        Makes an authenticated GET request to the specified endpoint and returns the response body, see get_response.
+
+        Args:
+            endpoint (str): The API endpoint to send the GET request to.
+            params (dict, optional): Optional query parameters to include in the request.
+            timeout (int, optional): Timeout for the request in seconds. Defaults to instance's timeout.
+
+        Returns:
+            bytes: The JSON response body.
+        """
         if timeout is None:
             timeout = self.timeout
         url = f'{self.server_url}{endpoint}'
         if params is None:
             params = {}
-        params.update({'login': self.username, 'password': self.password})
+        cache_key = (url, repr(sorted(params.items())))
+
+        # The credentials are merged into a new dict so the caller's parameters are not modified
+        params = {**params, 'login': self.username, 'password': self.password}
+
+        headers = {}
+        conditional = endpoint in _CONDITIONAL_ENDPOINTS
+        cached = None
+        if conditional:
+            with self._cache_lock:
+                cached = self._etag_cache.get(cache_key)
+        if cached is not None:
+            headers['If-None-Match'] = cached[0]
 
-        response = requests.get(url, params=params, timeout=timeout)
+        response = self.session.get(url, params=params, timeout=timeout, headers=headers)
         if response.status_code == 401:
             raise HTTPError(
                 response.url,
@@ -92,8 +231,21 @@ class UniDataAPIClient:
                 )
         response.raise_for_status()
 
-        return response.json()
+        # The body is kept rather than the parsed data, so callers modifying the returned data do not alter the cache
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
 
+        etag = response.headers.get('ETag')
+        if conditional and etag:
+            with self._cache_lock:
+                self._etag_cache[cache_key] = (etag, response.content)
+                self._etag_cache.move_to_end(cache_key)
+                if len(self._etag_cache) > _ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+
+        return response.content
+
+    @_cached_api
     def get_articles(self, **kwargs):
         """
         Retrieves articles from the UniData API with optional query parameters.
@@ -111,8 +263,65 @@ class UniDataAPIClient:
         Returns:
             dict: The articles data from the UniData API.
         """
-        return self.get_response('/articles', params=kwargs)
+        return self._get_content('/articles', params=kwargs)
+
+    def iter_articles(self, size=100, prefetch=2, **kwargs):
+        """
+        Iterates over the articles of all pages from the UniData API.
+        The next pages are requested in the background while the current one is processed.
+        The pages are not cached, so iterating over a large catalogue does not fill the cache of get_articles.
+
+        Args:
+            size (int, optional): The number of articles per page. Defaults to 100.
+            prefetch (int, optional): The number of pages requested ahead. Defaults to 2.
+            **kwargs: Optional query parameters to filter the articles, see get_articles.
+
+        Returns:
+            Iterator[dict]: The article rows.
+
+        Raises:
+            ValueError: If prefetch is not positive.
+        """
+        # Checked here rather than in the generator, so the error is raised by the call itself
+        if prefetch <= 0:
+            raise ValueError("prefetch must be positive")
+        return self._iter_articles(size, prefetch, **kwargs)
+
+    def _iter_articles(self, size, prefetch, **kwargs):
+        """
+        Iterates over the articles of all pages, see iter_articles.
+
+        Args:
+            size (int): The number of articles per page.
+            prefetch (int): The number of pages requested ahead.
+            **kwargs: Optional query parameters to filter the articles.
+
+        Yields:
+            dict: An article row.
+        """
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            pending = deque(
+                executor.submit(self.get_response, '/articles', params={'size': size, 'page': page, **kwargs})
+                for page in range(1, prefetch + 1)
+            )
+            next_page = prefetch + 1
+
+            while pending:
+                rows = pending.popleft().result().get('rows', [])
+                yield from rows
+
+                # A partial page is the last one
+                if len(rows) < size:
+                    for future in pending:
+                        future.cancel()
+                    break
+
+                pending.append(
+                    executor.submit(self.get_response, '/articles', params={'size': size, 'page': next_page, **kwargs})
+                    )
+                next_page += 1
 
+    @_cached_api
     def get_subcatalogues(self):
         """
         Retrieves subcatalogues from the UniData API.
@@ -120,8 +329,9 @@ class UniDataAPIClient:
         Returns:
             dict: The subcatalogues data from the UniData API.
         """
-        return self.get_response('/lists')
+        return self._get_content('/lists')
 
+    @_cached_api
     def get_intros(self):
         """
         Retrieves intros from the UniData API.
@@ -129,8 +339,9 @@ class UniDataAPIClient:
         Returns:
             dict: The intros data from the UniData API.
         """
-        return self.get_response('/intros')
+        return self._get_content('/intros')
 
+    @_cached_api
     def get_checklists(self):
         """
         Retrieves checklists from the UniData API.
@@ -138,4 +349,4 @@ class UniDataAPIClient:
         Returns:
             dict: The checklists data from the UniData API.
         """
-        return self.get_response('/checklists')
\ No newline at end of file
+        return self._get_content('/checklists')
\ No newline at end of file
@@ -10,9 +10,13 @@ In VSCode, Code Coverage is recorded in config.xml. Delete this file to reset re
 
 from __future__ import annotations
 
+import socket
+from json import dumps
 from typing import List
+from unittest.mock import Mock
 
 import pytest
+import requests
 from _pytest.nodes import Item
 
 
@@ -28,3 +32,41 @@ def pytest_collection_modifyitems(items: list[Item]):
 def unit_test_mocks(monkeypatch: None):
     """Include Mocks here to execute all commands offline and fast."""
     pass
+
+
+def _make_response(json=None, status=200, text=None, content=None, headers=None, url=None, raise_for_status=None):
+    response = Mock(spec=requests.Response)
+    response.status_code = status
+    response.headers = headers if headers is not None else {}
+    response.url = url
+    response.text = text
+    response.json.return_value = json
+    if content is None and json is not None:
+        content = dumps(json).encode()
+    response.content = content
+    if raise_for_status is not None:
+        response.raise_for_status.side_effect = raise_for_status
+    return response
+
+
+@pytest.fixture
+def make_response():
+    """Factory of mocked requests responses, restricted to the attributes of requests.Response.
+
+    The json payload is returned by json() and, unless content is given, serialized in content.
+    raise_for_status is the exception raised by raise_for_status(), if any."""
+    return _make_response
+
+
+def _blocked_network_call(*args, **kwargs):
+    raise RuntimeError("Network access is disabled in unit tests, mock the request instead.")
+
+
+@pytest.fixture(autouse=True)
+def block_network(request, monkeypatch):
+    """Make requests that are not mocked fail immediately instead of reaching the network.
+    Integration tests keep network access."""
+    if "integration" in request.keywords:
+        return
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", _blocked_network_call)
+    monkeypatch.setattr(socket.socket, "connect", _blocked_network_call)
@@ -1,9 +1,32 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 from msftoolbox.dhis2.metadata import Dhis2MetadataClient
 from msftoolbox.dhis2.data import Dhis2DataValuesClient
 import requests
 import json
+import gzip
+import io
+from msftoolbox._http import BasicAuth
+
+AUTH = BasicAuth('user', 'pass')
+
+@patch('requests.sessions.get_netrc_auth', return_value=('netrc_user', 'netrc_pass'))
+def test_auth_not_replaced_by_netrc(mock_netrc):
+    request = requests.Request('GET', 'http://example.com/api/indicators', auth=AUTH)
+    prepared = requests.Session().prepare_request(request)
+
+    assert prepared.headers['Authorization'] == 'Basic dXNlcjpwYXNz'
+
+@pytest.fixture(scope='session')
+def _metadata_client():
+    """A metadata client shared by the tests, which do not modify its configuration."""
+    return Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
+
+@pytest.fixture
+def metadata(_metadata_client):
+    """The shared metadata client, with a fresh mocked get_response."""
+    _metadata_client.get_response = MagicMock()
+    return _metadata_client
 
 def test_Dhis2MetadataClient_init():
     metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
@@ -28,26 +51,53 @@ def test_Dhis2MetadataClient_configure_dhis2_server():
     assert metadata.dhis2_password == 'newpass'
     assert metadata.dhis2_server_url == 'http://newserver.com'
 
-@patch('requests.get')
-def test_get_response_success(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'key': 'value'}
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_get_response_success(mock_get, make_response):
+    mock_get.return_value = make_response(json={'key': 'value'})
 
     metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
     url = 'http://example.com/api/someendpoint'
     result = metadata.get_response(url)
 
-    mock_get.assert_called_with(url, auth=('user', 'pass'), params=None)
+    mock_get.assert_called_with(url, auth=AUTH, params=None)
     assert result == {'key': 'value'}
 
-@patch('requests.get')
-def test_get_response_auth_failure(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 401
-    mock_response.raise_for_status.side_effect = requests.HTTPError('401 Client Error')
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_get_response_cached(mock_get, make_response):
+    mock_get.return_value = make_response(json={'indicators': [{'id': 'ind1'}]})
+
+    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com', cache_ttl={'indicators': 3600})
+    url = 'http://example.com/api/indicators'
+    first_result = metadata.get_response(url, params={'paging': False})
+    first_result['indicators'].clear()
+
+    assert metadata.get_response(url, params={'paging': False}) == {'indicators': [{'id': 'ind1'}]}
+    assert mock_get.call_count == 1
+
+    # Endpoints without a time to live are not cached
+    metadata.get_response('http://example.com/api/dataElements')
+    metadata.get_response('http://example.com/api/dataElements')
+    assert mock_get.call_count == 3
+
+    metadata.invalidate_cache()
+    metadata.get_response(url, params={'paging': False})
+    assert mock_get.call_count == 4
+
+@patch('msftoolbox.dhis2.metadata._CACHE_SIZE', 1)
+@patch('requests.Session.get')
+def test_get_response_cache_is_bounded(mock_get, make_response):
+    mock_get.return_value = make_response(json={'indicators': []})
+
+    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com', cache_ttl={'indicators': 3600})
+    url = 'http://example.com/api/indicators'
+    metadata.get_response(url, params={'page': 1})
+    metadata.get_response(url, params={'page': 2})
+
+    assert list(metadata._cache) == [(url, repr([('page', 2)]))]
+
+@patch('requests.Session.get')
+def test_get_response_auth_failure(mock_get, make_response):
+    mock_get.return_value = make_response(status=401, raise_for_status=requests.HTTPError('401 Client Error'))
 
     metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
     url = 'http://example.com/api/someendpoint'
@@ -55,14 +105,11 @@ def test_get_response_auth_failure(mock_get):
     with pytest.raises(ValueError, match='Authentication failed. Check your username and password.'):
         metadata.get_response(url)
 
-    mock_get.assert_called_with(url, auth=('user', 'pass'), params=None)
+    mock_get.assert_called_with(url, auth=AUTH, params=None)
 
-@patch('requests.get')
-def test_get_response_http_error(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 500
-    mock_response.raise_for_status.side_effect = requests.HTTPError('500 Server Error')
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_get_response_http_error(mock_get, make_response):
+    mock_get.return_value = make_response(status=500, raise_for_status=requests.HTTPError('500 Server Error'))
 
     metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
     url = 'http://example.com/api/someendpoint'
@@ -70,14 +117,11 @@ def test_get_response_http_error(mock_get):
     with pytest.raises(requests.HTTPError):
         metadata.get_response(url)
 
-    mock_get.assert_called_with(url, auth=('user', 'pass'), params=None)
+    mock_get.assert_called_with(url, auth=AUTH, params=None)
 
-@patch('requests.get')
-def test_get_response_invalid_json(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.side_effect = json.JSONDecodeError('Expecting value', '', 0)
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_get_response_invalid_json(mock_get, make_response):
+    mock_get.return_value = make_response(content=b'not json')
 
     metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
     url = 'http://example.com/api/someendpoint'
@@ -85,19 +129,17 @@ def test_get_response_invalid_json(mock_get):
     with pytest.raises(json.JSONDecodeError):
         metadata.get_response(url)
 
-    mock_get.assert_called_with(url, auth=('user', 'pass'), params=None)
+    mock_get.assert_called_with(url, auth=AUTH, params=None)
 
-def test_get_all_org_units():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'organisationUnits': [{'id': 'abc', 'name': 'Org Unit 1'}]})
+def test_get_all_org_units(metadata):
+    metadata.get_response.return_value = {'organisationUnits': [{'id': 'abc', 'name': 'Org Unit 1'}]}
 
     result = metadata.get_organisation_units(userOnly=True, paging=False)
     metadata.get_response.assert_called_with('http://example.com/api/organisationUnits', params={'userOnly': True, 'paging': False})
     assert result == [{'id': 'abc', 'name': 'Org Unit 1'}]
 
-def test_get_org_unit_children():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'organisationUnits': [{'id': 'child1', 'name': 'Child Org Unit'}]})
+def test_get_org_unit_children(metadata):
+    metadata.get_response.return_value = {'organisationUnits': [{'id': 'child1', 'name': 'Child Org Unit'}]}
 
     uid = 'parent1'
     result = metadata.get_org_unit_children(uid)
@@ -105,133 +147,41 @@ def test_get_org_unit_children():
     metadata.get_response.assert_called_with(expected_url)
     assert result == [{'id': 'child1', 'name': 'Child Org Unit'}]
 
-def test_get_indicators():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'indicators': [{'id': 'ind1', 'name': 'Indicator 1'}]})
-
-    result = metadata.get_indicators(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/indicators', params={'paging': False})
-    assert result == [{'id': 'ind1', 'name': 'Indicator 1'}]
-
-def test_get_data_elements():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'dataElements': [{'id': 'de1', 'name': 'Data Element 1'}]})
-
-    result = metadata.get_data_elements(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/dataElements', params={'paging': False})
-    assert result == [{'id': 'de1', 'name': 'Data Element 1'}]
-
-def test_get_datasets():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'dataSets': [{'id': 'ds1', 'name': 'DataSet 1'}]})
-
-    result = metadata.get_datasets(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/dataSets', params={'paging': False})
-    assert result == [{'id': 'ds1', 'name': 'DataSet 1'}]
-
-def test_get_programs():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'programs': [{'id': 'pr1', 'name': 'Program 1'}]})
-
-    result = metadata.get_programs(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/programs', params={'paging': False})
-    assert result == [{'id': 'pr1', 'name': 'Program 1'}]
-
-def test_get_program_stages():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'programStages': [{'id': 'ps1', 'name': 'Program Stage 1'}]})
-
-    result = metadata.get_program_stages(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/programStages', params={'paging': False})
-    assert result == [{'id': 'ps1', 'name': 'Program Stage 1'}]
-
-def test_get_program_rules():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'programRules': [{'id': 'pr1', 'name': 'Program Rule 1'}]})
-
-    result = metadata.get_program_rules(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/programRules', params={'paging': False})
-    assert result == [{'id': 'pr1', 'name': 'Program Rule 1'}]
-
-def test_get_indicator_groups():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'indicatorGroups': [{'id': 'ig1', 'name': 'Indicator Group 1'}]})
-
-    result = metadata.get_indicator_groups(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/indicatorGroups', params={'paging': False})
-    assert result == [{'id': 'ig1', 'name': 'Indicator Group 1'}]
-
-def test_get_program_indicators():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'programIndicators': [{'id': 'pi1', 'name': 'Program Indicator 1'}]})
-
-    result = metadata.get_program_indicators(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/programIndicators', params={'paging': False})
-    assert result == [{'id': 'pi1', 'name': 'Program Indicator 1'}]
-
-def test_get_program_indicator_groups():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'programIndicatorGroups': [{'id': 'pig1', 'name': 'Program Indicator Group 1'}]})
-
-    result = metadata.get_program_indicator_groups(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/programIndicatorGroups', params={'paging': False})
-    assert result == [{'id': 'pig1', 'name': 'Program Indicator Group 1'}]
-
-def test_get_data_element_groups():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'dataElementGroups': [{'id': 'deg1', 'name': 'Data Element Group 1'}]})
-
-    result = metadata.get_data_element_groups(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/dataElementGroups', params={'paging': False})
-    assert result == [{'id': 'deg1', 'name': 'Data Element Group 1'}]
-
-def test_get_option_sets():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'optionSets': [{'id': 'os1', 'name': 'Option Set 1'}]})
-
-    result = metadata.get_option_sets(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/optionSets', params={'paging': False})
-    assert result == [{'id': 'os1', 'name': 'Option Set 1'}]
-
-def test_get_options():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'options': [{'id': 'o1', 'name': 'Option 1'}]})
-
-    result = metadata.get_options(paging=False)
-    metadata.get_response.assert_called_with('http://example.com/api/options', params={'paging': False})
-    assert result == [{'id': 'o1', 'name': 'Option 1'}]
-
-def test_get_data_elements_for_org_unit():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
+@pytest.mark.parametrize('method, path, key, sample', [
+    ('get_indicators', 'indicators', 'indicators', {'id': 'ind1', 'name': 'Indicator 1'}),
+    ('get_data_elements', 'dataElements', 'dataElements', {'id': 'de1', 'name': 'Data Element 1'}),
+    ('get_datasets', 'dataSets', 'dataSets', {'id': 'ds1', 'name': 'DataSet 1'}),
+    ('get_programs', 'programs', 'programs', {'id': 'pr1', 'name': 'Program 1'}),
+    ('get_program_stages', 'programStages', 'programStages', {'id': 'ps1', 'name': 'Program Stage 1'}),
+    ('get_program_rules', 'programRules', 'programRules', {'id': 'pr1', 'name': 'Program Rule 1'}),
+    ('get_indicator_groups', 'indicatorGroups', 'indicatorGroups', {'id': 'ig1', 'name': 'Indicator Group 1'}),
+    ('get_program_indicators', 'programIndicators', 'programIndicators', {'id': 'pi1', 'name': 'Program Indicator 1'}),
+    ('get_program_indicator_groups', 'programIndicatorGroups', 'programIndicatorGroups', {'id': 'pig1', 'name': 'Program Indicator Group 1'}),
+    ('get_data_element_groups', 'dataElementGroups', 'dataElementGroups', {'id': 'deg1', 'name': 'Data Element Group 1'}),
+    ('get_option_sets', 'optionSets', 'optionSets', {'id': 'os1', 'name': 'Option Set 1'}),
+    ('get_options', 'options', 'options', {'id': 'o1', 'name': 'Option 1'}),
+])
+def test_get_metadata_list(metadata, method, path, key, sample):
+    metadata.get_response.return_value = {key: [sample]}
+
+    result = getattr(metadata, method)(paging=False)
+    metadata.get_response.assert_called_with(f'http://example.com/api/{path}', params={'paging': False})
+    assert result == [sample]
+
+def test_get_data_elements_for_org_unit(metadata):
+    metadata.get_response.return_value = {
+        'dataSets': [
+            {'id': 'dataSet1', 'dataSetElements': [{'dataElement': {'id': 'de1', 'name': 'Data Element 1'}},
+                                                   {'dataElement': {'id': 'de2', 'name': 'Data Element 2'}}]},
+            {'id': 'dataSet2', 'dataSetElements': [{'dataElement': {'id': 'de3', 'name': 'Data Element 3'}}]}
+        ]
+    }
 
-    def side_effect(url):
-        if 'organisationUnits/orgUnit1?fields=dataSets' in url:
-            return {
-                'dataSets': [{'id': 'dataSet1'}, {'id': 'dataSet2'}]
-            }
-        elif 'dataSets/dataSet1?fields=dataSetElements[dataElement]' in url:
-            return {
-                'dataSetElements': [{'dataElement': {'id': 'de1', 'name': 'Data Element 1'}},
-                                    {'dataElement': {'id': 'de2', 'name': 'Data Element 2'}}]
-            }
-        elif 'dataSets/dataSet2?fields=dataSetElements[dataElement]' in url:
-            return {
-                'dataSetElements': [{'dataElement': {'id': 'de3', 'name': 'Data Element 3'}}]
-            }
-        else:
-            return {}
-
-    metadata.get_response = MagicMock(side_effect=side_effect)
     org_unit_uid = 'orgUnit1'
     result = metadata.get_data_elements_for_org_unit(org_unit_uid)
 
-    called_urls = [call_args[0][0] for call_args in metadata.get_response.call_args_list]
-    expected_urls = [
-        f'http://example.com/api/organisationUnits/{org_unit_uid}?fields=dataSets',
-        'http://example.com/api/dataSets/dataSet1?fields=dataSetElements[dataElement]',
-        'http://example.com/api/dataSets/dataSet2?fields=dataSetElements[dataElement]'
-    ]
-    assert called_urls == expected_urls
+    expected_url = f'http://example.com/api/organisationUnits/{org_unit_uid}?fields=dataSets[id,dataSetElements[dataElement]]'
+    metadata.get_response.assert_called_once_with(expected_url)
 
     expected_data_elements = [
         {'id': 'de1', 'name': 'Data Element 1'},
@@ -240,52 +190,43 @@ def test_get_data_elements_for_org_unit():
     ]
     assert result == expected_data_elements
 
-def test_get_data_elements_for_org_unit_no_data_sets():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-
-    def side_effect(url):
-        if 'organisationUnits/orgUnit1?fields=dataSets' in url:
-            return {
-                'dataSets': []
-            }
-        else:
-            return {}
+def test_get_data_elements_for_org_unit_no_data_sets(metadata):
+    metadata.get_response.return_value = {'dataSets': []}
 
-    metadata.get_response = MagicMock(side_effect=side_effect)
     org_unit_uid = 'orgUnit1'
     result = metadata.get_data_elements_for_org_unit(org_unit_uid)
     assert result == []
     assert len(metadata.get_response.call_args_list) == 1
 
-def test_get_predictors():
-    metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
-    metadata.get_response = MagicMock(return_value={'predictors': [{'id': 'pred1', 'name': 'Predictor 1'}]})
+def test_get_data_elements_for_org_unit_duplicate_data_sets(metadata):
+    data_set = {'id': 'dataSet1', 'dataSetElements': [{'dataElement': {'id': 'de1', 'name': 'Data Element 1'}}]}
+    metadata.get_response.return_value = {'dataSets': [data_set, data_set]}
+
+    result = metadata.get_data_elements_for_org_unit('orgUnit1')
+    assert result == [{'id': 'de1', 'name': 'Data Element 1'}]
+
+def test_get_predictors(metadata):
+    metadata.get_response.return_value = {'predictors': [{'id': 'pred1', 'name': 'Predictor 1'}]}
 
     result = metadata.get_predictors()
     metadata.get_response.assert_called_with('http://example.com/api/predictors')
     assert result == [{'id': 'pred1', 'name': 'Predictor 1'}]
 
-@patch('requests.get')
-def test_export_metadata(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'meta': 'data'}
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_export_metadata(mock_get, make_response):
+    mock_get.return_value = make_response(json={'meta': 'data'})
 
     metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
     result = metadata.export_metadata(fields='id,name', indicators='true')
 
     expected_url = 'http://example.com/api/metadata'
     expected_params = {'fields': 'id,name', 'indicators': 'true'}
-    mock_get.assert_called_with(expected_url, auth=('user', 'pass'), params=expected_params)
+    mock_get.assert_called_with(expected_url, auth=AUTH, params=expected_params)
     assert result == {'meta': 'data'}
 
-@patch('requests.get')
-def test_export_metadata_http_error(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 500
-    mock_response.raise_for_status.side_effect = requests.HTTPError('500 Server Error')
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_export_metadata_http_error(mock_get, make_response):
+    mock_get.return_value = make_response(status=500, raise_for_status=requests.HTTPError('500 Server Error'))
 
     metadata = Dhis2MetadataClient(username='user', password='pass', server_url='http://example.com')
     with pytest.raises(requests.HTTPError):
@@ -293,16 +234,13 @@ def test_export_metadata_http_error(mock_get):
 
     expected_url = 'http://example.com/api/metadata'
     expected_params = {'fields': 'id,name'}
-    mock_get.assert_called_with(expected_url, auth=('user', 'pass'), params=expected_params)
+    mock_get.assert_called_with(expected_url, auth=AUTH, params=expected_params)
 
 # Tests for Dhis2DataValuesClient class
 
-@patch('requests.post')
-def test_send_data_values_json(mock_post):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'status': 'SUCCESS'}
-    mock_post.return_value = mock_response
+@patch('requests.Session.post')
+def test_send_data_values_json(mock_post, make_response):
+    mock_post.return_value = make_response(json={'status': 'SUCCESS'})
 
     data_values = {'dataValues': [{'dataElement': 'de1', 'value': '10'}]}
     data_values_json = data_values
@@ -313,16 +251,13 @@ def test_send_data_values_json(mock_post):
     expected_url = 'http://example.com/api/dataValueSets'
     expected_headers = {'Content-Type': 'application/json'}
     expected_params = {'dryRun': True}
-    expected_data = json.dumps(data_values_json)
-    mock_post.assert_called_with(expected_url, auth=('user', 'pass'), headers=expected_headers, params=expected_params, data=expected_data)
+    mock_post.assert_called_with(expected_url, headers=expected_headers, auth=AUTH, params=expected_params, data=ANY)
+    assert json.loads(mock_post.call_args.kwargs['data']) == data_values_json
     assert result == {'status': 'SUCCESS'}
 
-@patch('requests.post')
-def test_send_data_values_xml(mock_post):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'status': 'SUCCESS'}
-    mock_post.return_value = mock_response
+@patch('requests.Session.post')
+def test_send_data_values_xml(mock_post, make_response):
+    mock_post.return_value = make_response(json={'status': 'SUCCESS'})
 
     data_values_xml = '<dataValueSet></dataValueSet>'
     datavalues = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
@@ -332,45 +267,116 @@ def test_send_data_values_xml(mock_post):
     expected_headers = {'Content-Type': 'application/xml'}
     expected_params = {'preheatCache': True}
     expected_data = data_values_xml
-    mock_post.assert_called_with(expected_url, auth=('user', 'pass'), headers=expected_headers, params=expected_params, data=expected_data)
+    mock_post.assert_called_with(expected_url, headers=expected_headers, auth=AUTH, params=expected_params, data=expected_data)
     assert result == {'status': 'SUCCESS'}
 
-@patch('requests.get')
-def test_read_data_values(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'dataValues': [{'dataElement': 'de1', 'value': '10'}]}
-    mock_get.return_value = mock_response
+@patch('requests.Session.post')
+def test_send_data_values_compressed(mock_post, make_response):
+    mock_post.return_value = make_response(json={'status': 'SUCCESS'})
+
+    datavalues = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com', compress=True)
+    large_data_values = {'dataValues': [{'dataElement': f'de{i}', 'value': str(i)} for i in range(100)]}
+    datavalues.send_data_values(large_data_values, content_type='json')
+
+    headers = mock_post.call_args.kwargs['headers']
+    assert headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(mock_post.call_args.kwargs['data'])) == large_data_values
+
+    # Small bodies are sent as they are
+    datavalues.send_data_values('<dataValueSet></dataValueSet>', content_type='xml')
+    assert 'Content-Encoding' not in mock_post.call_args.kwargs['headers']
+    assert mock_post.call_args.kwargs['data'] == '<dataValueSet></dataValueSet>'
+
+@patch('requests.Session.post')
+def test_send_data_values_batch(mock_post, make_response):
+    mock_post.return_value = make_response(json={'status': 'SUCCESS'})
+
+    data_values_client = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
+    data_values = [{'dataElement': f'de{i}', 'period': '202401', 'orgUnit': 'ou1', 'value': str(i)} for i in range(5)]
+    result = data_values_client.send_data_values_batch(data_values, chunk_size=2, dryRun=True)
+
+    assert result == [{'status': 'SUCCESS'}] * 3
+    assert mock_post.call_count == 3
+    sent = [json.loads(call.kwargs['data'])['dataValues'] for call in mock_post.call_args_list]
+    assert sent == [data_values[0:2], data_values[2:4], data_values[4:5]]
+    assert all(call.kwargs['params'] == {'dryRun': True} for call in mock_post.call_args_list)
+
+@pytest.mark.parametrize('chunk_size', [0, -1])
+@patch('requests.Session.post')
+def test_send_data_values_batch_invalid_chunk_size(mock_post, chunk_size):
+    data_values_client = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
+
+    with pytest.raises(ValueError, match='chunk_size must be positive'):
+        data_values_client.send_data_values_batch([{'dataElement': 'de1', 'value': '1'}], chunk_size=chunk_size)
+    mock_post.assert_not_called()
+
+@patch('requests.Session.get')
+def test_read_data_values(mock_get, make_response):
+    mock_get.return_value = make_response(json={'dataValues': [{'dataElement': 'de1', 'value': '10'}]})
 
     datavalues = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
     result = datavalues.read_data_values(dataSet='ds1', period='202001', orgUnit='ou1')
 
     expected_url = 'http://example.com/api/dataValueSets'
     expected_params = {'dataSet': 'ds1', 'period': '202001', 'orgUnit': 'ou1'}
-    mock_get.assert_called_with(expected_url, auth=('user', 'pass'), params=expected_params)
+    mock_get.assert_called_with(expected_url, auth=AUTH, params=expected_params)
     assert result == {'dataValues': [{'dataElement': 'de1', 'value': '10'}]}
 
-@patch('requests.delete')
-def test_delete_data_value(mock_delete):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'status': 'SUCCESS'}
-    mock_delete.return_value = mock_response
+@patch('msftoolbox.dhis2.data.ijson', None)
+@patch('msftoolbox.dhis2.data.ijson', None)
+@patch('requests.Session.get')
+def test_read_data_values_iter(mock_get, make_response):
+    mock_get.return_value.__enter__.return_value = make_response(json={'dataValues': [{'dataElement': 'de1', 'value': '10'}, {'dataElement': 'de2', 'value': '20'}]})
+
+    datavalues = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
+    result = datavalues.read_data_values_iter(dataSet='ds1', period='202001', orgUnit='ou1')
+
+    assert next(result) == {'dataElement': 'de1', 'value': '10'}
+    assert list(result) == [{'dataElement': 'de2', 'value': '20'}]
+
+    expected_url = 'http://example.com/api/dataValueSets'
+    expected_params = {'dataSet': 'ds1', 'period': '202001', 'orgUnit': 'ou1'}
+    mock_get.assert_called_with(expected_url, auth=AUTH, params=expected_params, stream=True)
+
+@patch('requests.Session.get')
+def test_read_data_values_iter_streamed(mock_get, make_response):
+    ijson = pytest.importorskip('ijson')
+    response = make_response()
+    response.raw = io.BytesIO(b'{"dataValues": [{"dataElement": "de1", "value": 10.5}, {"dataElement": "de2", "value": 20}]}')
+    mock_get.return_value.__enter__.return_value = response
+
+    datavalues = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
+    with patch('msftoolbox.dhis2.data.ijson', ijson):
+        result = list(datavalues.read_data_values_iter(dataSet='ds1'))
+
+    assert result == [{'dataElement': 'de1', 'value': 10.5}, {'dataElement': 'de2', 'value': 20}]
+    assert isinstance(result[0]['value'], float)
+    assert response.raw.decode_content is True
+
+@patch('requests.Session.delete')
+def test_delete_data_value(mock_delete, make_response):
+    mock_delete.return_value = make_response(json={'status': 'SUCCESS'})
 
     datavalues = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
     result = datavalues.delete_data_value(data_element='de1', period='202001', org_unit='ou1')
 
     expected_url = 'http://example.com/api/dataValues'
     expected_params = {'de': 'de1', 'pe': '202001', 'ou': 'ou1', 'co': None, 'cc': None}
-    mock_delete.assert_called_with(expected_url, auth=('user', 'pass'), params=expected_params)
+    mock_delete.assert_called_with(expected_url, auth=AUTH, params=expected_params)
     assert result == {'status': 'SUCCESS'}
 
-@patch('requests.post')
-def test_send_individual_data_value(mock_post):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'status': 'SUCCESS'}
-    mock_post.return_value = mock_response
+@patch('requests.Session.delete')
+def test_delete_data_value_no_content(mock_delete, make_response):
+    mock_delete.return_value = make_response(status=204, content=b'')
+
+    datavalues = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
+    result = datavalues.delete_data_value(data_element='de1', period='202001', org_unit='ou1')
+
+    assert result == {}
+
+@patch('requests.Session.post')
+def test_send_individual_data_value(mock_post, make_response):
+    mock_post.return_value = make_response(json={'status': 'SUCCESS'})
 
     data_value = {
         "dataElement": "fbfJHSPpUQD",
@@ -386,21 +392,18 @@ def test_send_individual_data_value(mock_post):
 
     expected_url = 'http://example.com/api/dataValues'
     expected_headers = {'Content-Type': 'application/json'}
-    expected_data = json.dumps(data_value)
-    mock_post.assert_called_with(expected_url, auth=('user', 'pass'), headers=expected_headers, data=expected_data)
+    mock_post.assert_called_with(expected_url, headers=expected_headers, auth=AUTH, data=ANY)
+    assert json.loads(mock_post.call_args.kwargs['data']) == data_value
     assert result == {'status': 'SUCCESS'}
 
-@patch('requests.get')
-def test_read_individual_data_value(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'dataValue': {'dataElement': 'de1', 'value': '10'}}
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_read_individual_data_value(mock_get, make_response):
+    mock_get.return_value = make_response(json={'dataValue': {'dataElement': 'de1', 'value': '10'}})
 
     datavalues = Dhis2DataValuesClient(username='user', password='pass', server_url='http://example.com')
     result = datavalues.read_individual_data_value(data_element='de1', period='202001', org_unit='ou1')
 
     expected_url = 'http://example.com/api/dataValues'
     expected_params = {'de': 'de1', 'pe': '202001', 'ou': 'ou1', 'co': None, 'cc': None}
-    mock_get.assert_called_with(expected_url, auth=('user', 'pass'), params=expected_params)
+    mock_get.assert_called_with(expected_url, auth=AUTH, params=expected_params)
     assert result == {'dataValue': {'dataElement': 'de1', 'value': '10'}}
@@ -15,17 +15,14 @@ def test_list_reports_invalid_date():
     with pytest.raises(ValueError):
         extractor.list_reports("2023-10-02", "2023-10-01", "query")
 
-# Mocking the requests.get for list_reports
-@patch('requests.get')
-def test_list_reports(mock_get):
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
+# Mocking the session get for list_reports
+@patch('requests.Session.get')
+def test_list_reports(mock_get, make_response):
+    mock_get.return_value = make_response(json={
         "articles": [
             {"title": "Sample Article", "url": "https://example.com/article/1"}
         ]
-    }
-    mock_get.return_value = mock_response
+    })
 
     extractor = GDELTClient()
     articles = extractor.list_reports("2023-10-01", "2023-10-02", "query")
@@ -33,36 +30,106 @@ def test_list_reports(mock_get):
     assert articles[0]["title"] == "Sample Article"
 
 # Test HTTPError for list_reports
-@patch('requests.get')
-def test_list_reports_http_error(mock_get):
-    mock_response = Mock()
-    mock_response.status_code = 404
-    mock_response.text = "Not Found"
-    mock_response.raise_for_status.side_effect = requests.HTTPError("Not Found")
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_list_reports_http_error(mock_get, make_response):
+    mock_get.return_value = make_response(status=404, text="Not Found", raise_for_status=requests.HTTPError("Not Found"))
 
     extractor = GDELTClient()
     with pytest.raises(requests.HTTPError):
         extractor.list_reports("2023-10-01", "2023-10-02", "query")
 
 # Mocking the newspaper.Article for get_report
+@patch('requests.Session.get')
 @patch('newspaper.Article')
-def test_get_report(mock_article):
+def test_get_report(mock_article, mock_get):
+    mock_get.return_value.text = "<html>Full article</html>"
     mock_article_instance = mock_article.return_value
-    mock_article_instance.download = Mock()
     mock_article_instance.parse = Mock()
     mock_article_instance.text = "Full article text"
+    mock_article_instance.config.headers = {}
 
     extractor = GDELTClient()
     report = extractor.get_report("https://example.com/article/1")
     assert report["text"] == "Full article text"
+    mock_get.assert_called_once()
+    assert mock_get.call_args.args == ("https://example.com/article/1",)
+    assert mock_get.call_args.kwargs["timeout"] == 10
+    assert mock_get.call_args.kwargs["headers"] == {"User-Agent": mock_article_instance.config.browser_user_agent}
+    mock_get.return_value.raise_for_status.assert_called_once()
+    mock_article_instance.set_html.assert_called_once_with("<html>Full article</html>")
+
+# Test that the charset of the meta tags is used when the Content-Type header has none
+@patch('requests.Session.get')
+@patch('newspaper.Article')
+def test_get_report_meta_charset(mock_article, mock_get):
+    html = '<html><head><meta charset="utf-8"></head><body>Médecins Sans Frontières</body></html>'
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/html"
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = html.encode("utf-8")
+    mock_get.return_value = response
+
+    extractor = GDELTClient()
+    extractor.get_report("https://example.com/article/1")
+    mock_article.return_value.set_html.assert_called_once_with(html)
+
+# Test that error pages are not parsed as articles
+@patch('requests.Session.get')
+@patch('newspaper.Article')
+def test_get_report_http_error(mock_article, mock_get, make_response):
+    mock_get.return_value = make_response(status=403, text="Forbidden", raise_for_status=requests.HTTPError("403"))
+
+    extractor = GDELTClient()
+    report = extractor.get_report("https://example.com/article/1")
+    assert report["text"] is None
+    mock_article.return_value.set_html.assert_not_called()
 
 # Test error handling in get_report
+@patch('requests.Session.get')
 @patch('newspaper.Article')
-def test_get_report_error(mock_article):
-    mock_article_instance = mock_article.return_value
-    mock_article_instance.download.side_effect = Exception("Download error")
+def test_get_report_error(mock_article, mock_get):
+    mock_get.side_effect = requests.ConnectionError("Download error")
 
     extractor = GDELTClient()
     report = extractor.get_report("https://example.com/article/1")
-    assert report["text"] is None
\ No newline at end of file
+    assert report["text"] is None
+
+# Mocking newspaper.Article for get_reports
+@patch('requests.Session.get')
+@patch('newspaper.Article')
+def test_get_reports(mock_article, mock_get):
+    def make_article(url):
+        article = Mock()
+        article.text = f"Text of {url}"
+        return article
+    mock_article.side_effect = make_article
+
+    extractor = GDELTClient()
+    urls = [f"https://example.com/article/{i}" for i in range(5)]
+    reports = extractor.get_reports(urls, max_workers=3)
+    assert reports == [{"text": f"Text of {url}"} for url in urls]
+
+# Test that get_report only downloads a report once
+@patch('requests.Session.get')
+@patch('newspaper.Article')
+def test_get_report_cached(mock_article, mock_get):
+    mock_article.return_value.text = "Full article text"
+
+    extractor = GDELTClient()
+    first_report = extractor.get_report("https://example.com/article/1")
+    second_report = extractor.get_report("https://example.com/article/1")
+    assert first_report == second_report == {"text": "Full article text"}
+    assert mock_article.call_count == 1
+
+# Test that failed downloads are retried once expired
+@patch('msftoolbox.gdelt.data._FAILED_REPORT_TTL', 0)
+@patch('requests.Session.get')
+@patch('newspaper.Article')
+def test_get_report_error_not_cached(mock_article, mock_get):
+    mock_get.side_effect = requests.ConnectionError("Download error")
+
+    extractor = GDELTClient()
+    extractor.get_report("https://example.com/article/1")
+    extractor.get_report("https://example.com/article/1")
+    assert mock_get.call_count == 2
@@ -1,49 +1,50 @@
 import pytest
 import requests
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 from msftoolbox.reliefweb.data import ReliefWebClient  # Replace with the actual module name
 
+@pytest.fixture(scope="module")
+def extractor():
+    """A client shared by the tests, it holds no state between calls."""
+    return ReliefWebClient()
+
 # Test ReliefWebClient initialization
-def test_initialization():
-    extractor = ReliefWebClient()
+def test_initialization(extractor):
     assert extractor.app_name == "testing-rwapi"
     assert extractor.preset == "latest"
     assert extractor.limit == 50
     assert extractor.profile == "full"
 
 # Test try_key method
-def test_try_key():
-    extractor = ReliefWebClient()
+def test_try_key(extractor):
     data = {'title': 'Sample Report', 'key1': 'value1'}
     assert extractor.try_key('key1', data) == 'value1'
     assert extractor.try_key('key2', data) is None
 
 # Test validate_date method
-def test_validate_date():
-    extractor = ReliefWebClient()
-    assert extractor.validate_date("2023-10-01") is True
-    assert extractor.validate_date("2023-02-30") is False
-    assert extractor.validate_date("2023-13-01") is False
-    assert extractor.validate_date("2023-10-32") is False
+@pytest.mark.parametrize("date_string, expected", [
+    ("2023-10-01", True),
+    ("2023-02-30", False),
+    ("2023-13-01", False),
+    ("2023-10-32", False),
+])
+def test_validate_date(extractor, date_string, expected):
+    assert extractor.validate_date(date_string) is expected
 
 # Test list_reports with invalid date
-def test_list_reports_invalid_date():
-    extractor = ReliefWebClient()
+def test_list_reports_invalid_date(extractor):
     with pytest.raises(ValueError):
         extractor.list_reports("2023-10-01", "invalid-date", "query")
 
 # Test list_reports with invalid query_operator
-def test_list_reports_invalid_operator():
-    extractor = ReliefWebClient()
+def test_list_reports_invalid_operator(extractor):
     with pytest.raises(ValueError):
         extractor.list_reports("2023-10-01", "2023-10-02", "query", query_operator="INVALID")
 
-# Mocking the requests.post for list_reports
-@patch('requests.post')
-def test_list_reports(mock_post):
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
+# Mocking the session post for list_reports
+@patch('requests.Session.post')
+def test_list_reports(mock_post, extractor, make_response):
+    mock_post.return_value = make_response(json={
         "data": [{
             "id": "1",
             "fields": {
@@ -54,20 +55,16 @@ def test_list_reports(mock_post):
             },
             "href": "https://example.com/report/1"
         }]
-    }
-    mock_post.return_value = mock_response
+    })
 
-    extractor = ReliefWebClient()
     reports = extractor.list_reports("2023-10-01", "2023-10-02", "query")
     assert len(reports) == 1
     assert reports[0]["title"] == "Sample Report"
 
-# Mocking the requests.get for get_report
-@patch('requests.get')
-def test_get_report(mock_get):
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
+# Mocking the session get for get_report
+@patch('requests.Session.get')
+def test_get_report(mock_get, extractor, make_response):
+    mock_get.return_value = make_response(json={
         "data": {
             "id": "1",
             "fields": {
@@ -75,33 +72,44 @@ def test_get_report(mock_get):
                 "body": "Report content"
             }
         }
-    }
-    mock_get.return_value = mock_response
+    })
 
-    extractor = ReliefWebClient()
     report = extractor.get_report("https://example.com/report/1")
     assert report["fields"]["title"] == "Sample Report"
 
 # Test HTTPError for list_reports
-@patch('requests.post')
-def test_list_reports_http_error(mock_post):
-    mock_response = Mock()
-    mock_response.status_code = 404
-    mock_response.text = "Not Found"
-    mock_post.return_value = mock_response
-
-    extractor = ReliefWebClient()
+@patch('requests.Session.post')
+def test_list_reports_http_error(mock_post, extractor, make_response):
+    mock_post.return_value = make_response(status=404, text="Not Found")
+
     with pytest.raises(requests.HTTPError):
         extractor.list_reports("2023-10-01", "2023-10-02", "query")
 
 # Test HTTPError for get_report
-@patch('requests.get')
-def test_get_report_http_error(mock_get):
-    mock_response = Mock()
-    mock_response.status_code = 404
-    mock_response.text = "Not Found"
-    mock_get.return_value = mock_response
-
-    extractor = ReliefWebClient()
+@patch('requests.Session.get')
+def test_get_report_http_error(mock_get, extractor, make_response):
+    mock_get.return_value = make_response(status=404, text="Not Found")
+
     with pytest.raises(requests.HTTPError):
-        extractor.get_report("https://example.com/report/1")
\ No newline at end of file
+        extractor.get_report("https://example.com/report/1")
+
+# Mocking the session post for list_reports returning a DataFrame
+@patch('requests.Session.post')
+def test_list_reports_as_dataframe(mock_post, extractor, make_response):
+    mock_post.return_value = make_response(json={
+        "data": [{
+            "id": "1",
+            "fields": {
+                "title": "Sample Report",
+                "source": [{"name": "Source1"}, {"name": "Source2"}],
+                "language": [{"name": "English"}],
+                "date": {"original": "2023-10-01"},
+            },
+            "href": "https://example.com/report/1"
+        }]
+    })
+
+    reports = extractor.list_reports("2023-10-01", "2023-10-02", "query", as_dataframe=True)
+    assert list(reports.columns) == ["id", "title", "source_name", "language", "date", "url"]
+    assert len(reports) == 1
+    assert reports.loc[0, "source_name"] == "Source1 / Source2"
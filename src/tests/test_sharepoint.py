@@ -0,0 +1,313 @@
+import json
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, PropertyMock, patch
+import pytest
+import requests
+from office365.runtime.auth.authentication_context import AuthenticationContext
+from msftoolbox.sharepoint import files
+from msftoolbox.sharepoint._cache import FolderCache
+from msftoolbox.sharepoint.files import SharePointFileClient, clear_authentication_cache
+
+SITE_URL = 'https://example.sharepoint.com/sites/site'
+
+
+@pytest.fixture(autouse=True)
+def offline_authentication():
+    """Authenticate the requests without contacting Microsoft, and share no context between the tests."""
+    clear_authentication_cache()
+    with patch.object(AuthenticationContext, 'authenticate_request'):
+        yield
+    clear_authentication_cache()
+
+
+@pytest.fixture
+def context():
+    """A mocked ClientContext returned by the context property of every client."""
+    with patch.object(SharePointFileClient, 'context', new_callable=PropertyMock) as context_property:
+        context_property.return_value = MagicMock()
+        yield context_property.return_value
+
+
+def make_client(**kwargs):
+    return SharePointFileClient(site_url=SITE_URL, client_id='id', client_secret='secret', **kwargs)
+
+
+def listing_response(make_response, folders=(), files=()):
+    def record(url):
+        return {'Name': url.rsplit('/', 1)[-1], 'ServerRelativeUrl': url, 'TimeLastModified': '2024-01-02T03:04:05Z'}
+    payload = {}
+    if folders is not None:
+        payload['Folders'] = [record(url) for url in folders]
+    if files is not None:
+        payload['Files'] = [record(url) for url in files]
+    return make_response(json=payload)
+
+
+def test_clients_share_authentication():
+    client = make_client()
+    assert make_client().authentication_context is client.authentication_context
+    assert 'secret' not in ''.join(files._AUTH_CACHE)
+
+    client.forget_authentication()
+    assert make_client().authentication_context is not client.authentication_context
+
+def test_missing_credentials():
+    with pytest.raises(ValueError):
+        SharePointFileClient(site_url=SITE_URL)
+
+@patch('requests.Session.request')
+def test_list_files_in_folder(mock_request, make_response):
+    mock_request.return_value = listing_response(make_response, folders=None, files=['/sites/site/Docs/a.txt'])
+
+    result = make_client().list_files_in_folder('/sites/site/Docs')
+
+    assert result == [{
+        'Name': 'a.txt',
+        'ServerRelativeUrl': '/sites/site/Docs/a.txt',
+        'TimeLastModified': datetime(2024, 1, 2, 3, 4, 5)
+        }]
+    params = mock_request.call_args.kwargs['params']
+    assert params['$expand'] == 'Files'
+    assert params['$select'] == 'Files/Name,Files/ServerRelativeUrl,Files/TimeLastModified'
+    assert mock_request.call_args.kwargs['headers']['Accept'] == 'application/json;odata=nometadata'
+
+@patch('requests.Session.request')
+def test_recursively_list_folders_only_expands_folders(mock_request, make_response):
+    tree = {
+        '/sites/site/Docs': ['/sites/site/Docs/a', '/sites/site/Docs/b'],
+        '/sites/site/Docs/a': ['/sites/site/Docs/a/c'],
+        }
+    def respond(method, url, **kwargs):
+        folder_url = url.split("('", 1)[1].split("')", 1)[0].replace('%2F', '/')
+        return listing_response(make_response, folders=tree.get(folder_url, []), files=None)
+    mock_request.side_effect = respond
+
+    result = make_client().recursively_list_folders('/sites/site/Docs')
+
+    assert sorted(folder['ServerRelativeUrl'] for folder in result) == [
+        '/sites/site/Docs/a', '/sites/site/Docs/a/c', '/sites/site/Docs/b'
+        ]
+    assert mock_request.call_count == 4
+    assert all(call.kwargs['params']['$expand'] == 'Folders' for call in mock_request.call_args_list)
+
+@patch('requests.Session.request')
+def test_listing_not_cached_by_default(mock_request, make_response):
+    mock_request.return_value = listing_response(make_response, files=[])
+
+    client = make_client()
+    client.list_files_in_folder('/sites/site/Docs')
+    client.list_files_in_folder('/sites/site/Docs')
+
+    assert mock_request.call_count == 2
+
+@patch('requests.Session.request')
+def test_listing_cached_and_invalidated(mock_request, make_response):
+    mock_request.return_value = listing_response(make_response, folders=None, files=['/sites/site/Docs/a.txt'])
+
+    client = make_client(cache_ttl=60)
+    first_result = client.list_files_in_folder('/sites/site/Docs')
+    first_result[0]['Name'] = 'modified'
+
+    assert client.list_files_in_folder('/sites/site/Docs/')[0]['Name'] == 'a.txt'
+    assert mock_request.call_count == 1
+
+    client.invalidate('/sites/site/Docs')
+    client.list_files_in_folder('/sites/site/Docs')
+    assert mock_request.call_count == 2
+
+def test_folder_cache_recursive_invalidation():
+    cache = FolderCache(ttl=60)
+    for url in ['/a', '/a/b', '/ab']:
+        cache.get_or_load((url, 'exists'), lambda: True)
+    cache.remember_folder('/a/b/c')
+
+    cache.invalidate('/a/b')
+    assert cache.is_known_folder('/a/b')
+
+    cache.invalidate('/a', recursive=True)
+    assert [key[0] for key in cache._entries] == ['/ab']
+    assert not cache.is_known_folder('/a/b/c')
+    assert not cache.is_known_folder('/a')
+
+    cache.invalidate()
+    assert not cache._entries
+
+@patch('msftoolbox.sharepoint._cache._FOLDER_CACHE_SIZE', 2)
+def test_folder_cache_evicts_expired_and_least_recently_used():
+    cache = FolderCache(ttl=60)
+    cache.get_or_load(('/a', 'exists'), lambda: True)
+    cache.get_or_load(('/b', 'exists'), lambda: True)
+    cache.get_or_load(('/a', 'exists'), lambda: False)
+    cache.get_or_load(('/c', 'exists'), lambda: True)
+    assert list(cache._entries) == [('/a', 'exists'), ('/c', 'exists')]
+
+    cache._entries[('/a', 'exists')] = (time.monotonic() - 1, True)
+    cache.get_or_load(('/d', 'exists'), lambda: True)
+    assert list(cache._entries) == [('/c', 'exists'), ('/d', 'exists')]
+
+def test_folder_cache_disabled():
+    cache = FolderCache()
+    cache.remember_folder('/a')
+    assert cache.get_or_load(('/a', 'exists'), lambda: True)
+    assert not cache._entries
+    assert not cache.is_known_folder('/a')
+
+def test_create_folder_if_not_exists_skips_known_folders(context):
+    context.web.ensure_folder_path.return_value.get.return_value.select.return_value \
+        .execute_query_with_incremental_retry.return_value.properties = {'ServerRelativeUrl': '/sites/site/Docs/new'}
+
+    client = make_client(cache_ttl=60)
+    assert client.create_folder_if_not_exists('/sites/site/Docs/new') == '/sites/site/Docs/new'
+    assert client.create_folder_if_not_exists('/sites/site/Docs/new/') == '/sites/site/Docs/new'
+    assert context.web.ensure_folder_path.call_count == 1
+
+    # A recycled folder is created again
+    client.recycle_file('/sites/site/Docs/new')
+    client.create_folder_if_not_exists('/sites/site/Docs/new')
+    assert context.web.ensure_folder_path.call_count == 2
+
+def test_move_files_in_batches(context):
+    client = make_client(cache_ttl=60)
+    client._folder_cache.get_or_load(('/sites/site/Docs/old', 'exists'), lambda: True)
+    client._folder_cache.get_or_load(('/sites/site/Archive', 'exists'), lambda: True)
+
+    client.move_files([('/sites/site/Docs/old/a.txt', '/sites/site/Archive'), ('/sites/site/Docs/b.txt', '/sites/site/Archive')], batch_size=50)
+
+    assert context.web.get_file_by_server_relative_url.call_count == 2
+    context.web.get_file_by_server_relative_url.return_value.moveto.assert_called_with('/sites/site/Archive', 0)
+    context.execute_batch.assert_called_once_with(50)
+    context.execute_query_with_incremental_retry.assert_not_called()
+    assert not client._folder_cache._entries
+
+def test_rename_files_in_batches(context):
+    client = make_client()
+    client.rename_files([('/sites/site/Docs/a.txt', 'b.txt')])
+
+    context.web.get_file_by_server_relative_url.return_value.rename.assert_called_once_with('b.txt')
+    context.execute_batch.assert_called_once_with(100)
+
+    with pytest.raises(ValueError):
+        client.rename_files([('/sites/site/Docs/a.txt', 'sub/b.txt')])
+
+def test_recycle_files_in_batches(context):
+    client = make_client()
+    client.recycle_files(['/sites/site/Docs/a.txt', '/sites/site/Docs/b.txt'], batch_size=1)
+
+    assert context.web.get_file_by_server_relative_url.return_value.recycle.call_count == 2
+    context.execute_batch.assert_called_once_with(1)
+
+@patch('msftoolbox.sharepoint._transport.random.uniform', return_value=0.5)
+@patch('msftoolbox.sharepoint._transport.time.sleep')
+@patch('requests.Session.request')
+def test_send_retries_throttled_requests(mock_request, mock_sleep, mock_uniform, make_response):
+    mock_request.side_effect = [
+        make_response(status=429, headers={'Retry-After': '3'}),
+        make_response(status=503),
+        make_response(status=200),
+        ]
+
+    client = make_client()
+    with client._transport.send('GET', f'{SITE_URL}/_api/web') as response:
+        assert response.status_code == 200
+
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [3.5, 2.5]
+    assert client._transport._request_slots._value == 8
+
+@patch('msftoolbox.sharepoint._transport.time.sleep')
+@patch('requests.Session.request')
+def test_send_returns_last_throttled_response(mock_request, mock_sleep, make_response):
+    mock_request.return_value = make_response(status=429)
+
+    client = make_client()
+    with client._transport.send('GET', f'{SITE_URL}/_api/web', max_retries=2) as response:
+        assert response.status_code == 429
+
+    assert mock_request.call_count == 3
+    assert client._transport._request_slots._value == 8
+
+@patch('requests.Session.request')
+def test_send_limits_concurrent_requests(mock_request, make_response):
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def respond(method, url, **kwargs):
+        with lock:
+            in_flight.append(url)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(url)
+        return make_response(status=200)
+    mock_request.side_effect = respond
+
+    client = make_client(max_concurrent_requests=2)
+    def send(index):
+        with client._transport.send('GET', f'{SITE_URL}/_api/{index}'):
+            pass
+    threads = [threading.Thread(target=send, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mock_request.call_count == 8
+    assert max(peak) <= 2
+
+@patch('requests.Session.request')
+def test_download_file_multipart(mock_request, context, make_response, tmp_path):
+    content = b'0123456789'
+    context.web.get_file_by_server_relative_url.return_value.get.return_value.select.return_value \
+        .execute_query_with_incremental_retry.return_value.properties = {'Length': str(len(content))}
+
+    def respond(method, url, headers, **kwargs):
+        start, end = (int(byte) for byte in headers['Range'][len('bytes='):].split('-'))
+        response = make_response(status=206)
+        response.iter_content.return_value = [content[start:end + 1]]
+        return response
+    mock_request.side_effect = respond
+
+    destination = tmp_path / 'file.bin'
+    make_client().download_file_multipart('/sites/site/Docs/file.bin', str(destination), parts=3)
+
+    assert destination.read_bytes() == content
+    assert sorted(call.kwargs['headers']['Range'] for call in mock_request.call_args_list) == [
+        'bytes=0-3', 'bytes=4-7', 'bytes=8-9'
+        ]
+
+@patch('requests.Session.request')
+def test_download_range_requires_partial_content(mock_request, make_response, tmp_path):
+    mock_request.return_value = make_response(status=200)
+    destination = tmp_path / 'file.bin'
+    destination.write_bytes(b'\0' * 10)
+
+    client = make_client()
+    with pytest.raises(requests.HTTPError):
+        client._download_range(f'{SITE_URL}/_api/file', {}, str(destination), (0, 4), 1024)
+
+@patch('requests.get')
+def test_iter_files_in_folder_follows_next_pages(mock_get):
+    def page(name, next_url=None):
+        results = {'results': [{'File': {
+            'Name': name,
+            'ServerRelativeUrl': f'/sites/site/Docs/{name}',
+            'TimeLastModified': '2024-01-02T03:04:05Z'
+            }}]}
+        if next_url:
+            results['__next'] = next_url
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Type'] = 'application/json;odata=verbose'
+        response._content = json.dumps({'d': results}).encode()
+        return response
+    mock_get.side_effect = [page('a.txt', f'{SITE_URL}/_api/next?$skiptoken=1'), page('b.txt')]
+
+    result = list(make_client().iter_files_in_folder('/sites/site/Docs', page_size=1))
+
+    assert [file['Name'] for file in result] == ['a.txt', 'b.txt']
+    first_url = mock_get.call_args_list[0].kwargs['url']
+    assert "/ListItemAllFields/ParentList/items?" in first_url
+    assert "$filter=FileDirRef eq '/sites/site/Docs' and FSObjType eq 0" in first_url
+    assert mock_get.call_args_list[1].kwargs['url'] == f'{SITE_URL}/_api/next?$skiptoken=1'
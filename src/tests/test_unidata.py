@@ -1,6 +1,6 @@
 from urllib.error import HTTPError
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import requests
 from msftoolbox.unidata.data import UniDataAPIClient  # Replace 'your_module' with the actual module name
 
@@ -21,12 +21,23 @@ def test_UniDataAPIClient_configure_unidata_server():
     assert client.password == 'newpass'
     assert client.server_url == 'https://newserver.com'
 
-@patch('requests.get')
-def test_get_response_success(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'key': 'value'}
-    mock_get.return_value = mock_response
+@patch('requests.Session.close')
+def test_UniDataAPIClient_context_manager(mock_close):
+    with UniDataAPIClient(username='user', password='pass', server_url='https://example.com') as client:
+        assert isinstance(client, UniDataAPIClient)
+    mock_close.assert_not_called()
+
+def test_clients_share_connection_pools_but_not_cookies():
+    client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
+    other_client = UniDataAPIClient(username='other', password='pass', server_url='https://example.com')
+
+    client.session.cookies.set('JSESSIONID', 'abc')
+    assert not other_client.session.cookies
+    assert client.session.get_adapter('https://example.com') is other_client.session.get_adapter('https://example.com')
+
+@patch('requests.Session.get')
+def test_get_response_success(mock_get, make_response):
+    mock_get.return_value = make_response(json={'key': 'value'})
 
     client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
     endpoint = '/api/someendpoint'
@@ -34,15 +45,12 @@ def test_get_response_success(mock_get):
 
     expected_url = 'https://example.com/api/someendpoint'
     expected_params = {'login': 'user', 'password': 'pass'}
-    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout)
+    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout, headers={})
     assert result == {'key': 'value'}
 
-@patch('requests.get')
-def test_get_response_auth_failure(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 401
-    mock_response.raise_for_status.side_effect = requests.HTTPError('401 Client Error')
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_get_response_auth_failure(mock_get, make_response):
+    mock_get.return_value = make_response(status=401, raise_for_status=requests.HTTPError('401 Client Error'))
 
     client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
     endpoint = '/api/someendpoint'
@@ -52,14 +60,11 @@ def test_get_response_auth_failure(mock_get):
 
     expected_url = 'https://example.com/api/someendpoint'
     expected_params = {'login': 'user', 'password': 'pass'}
-    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout)
+    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout, headers={})
 
-@patch('requests.get')
-def test_get_response_http_error(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 500
-    mock_response.raise_for_status.side_effect = requests.HTTPError('500 Server Error')
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_get_response_http_error(mock_get, make_response):
+    mock_get.return_value = make_response(status=500, raise_for_status=requests.HTTPError('500 Server Error'))
 
     client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
     endpoint = '/api/someendpoint'
@@ -69,64 +74,138 @@ def test_get_response_http_error(mock_get):
 
     expected_url = 'https://example.com/api/someendpoint'
     expected_params = {'login': 'user', 'password': 'pass'}
-    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout)
+    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout, headers={})
+
+@patch('requests.Session.get')
+def test_get_response_not_modified(mock_get, make_response):
+    first_response = make_response(headers={'ETag': '"v1"'}, json={'key': 'value'})
 
-@patch('requests.get')
-def test_get_articles(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'articles': [{'id': 'art1', 'title': 'Article 1'}]}
-    mock_get.return_value = mock_response
+    not_modified_response = make_response(status=304)
+    mock_get.side_effect = [first_response, not_modified_response]
 
     client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
-    result = client.get_articles(mode=1)
+    endpoint = '/checklists'
+    assert client.get_response(endpoint) == {'key': 'value'}
+    assert client.get_response(endpoint) == {'key': 'value'}
 
-    expected_url = 'https://example.com/articles'
-    expected_params = {'login': 'user', 'password': 'pass', 'mode': 1}
-    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout)
-    assert result == {'articles': [{'id': 'art1', 'title': 'Article 1'}]}
+    expected_url = 'https://example.com/checklists'
+    expected_params = {'login': 'user', 'password': 'pass'}
+    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout, headers={'If-None-Match': '"v1"'})
+    not_modified_response.json.assert_not_called()
 
-@patch('requests.get')
-def test_get_subcatalogues(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'subcatalogues': [{'id': 'sc1', 'name': 'Subcatalogue 1'}]}
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_invalidate_cache_clears_etags(mock_get, make_response):
+    mock_get.return_value = make_response(headers={'ETag': '"v1"'}, json={'key': 'value'})
 
     client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
-    result = client.get_subcatalogues()
+    client.get_checklists()
+    assert len(client._etag_cache) == 1
 
-    expected_url = 'https://example.com/lists'
-    expected_params = {'login': 'user', 'password': 'pass'}
-    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout)
-    assert result == {'subcatalogues': [{'id': 'sc1', 'name': 'Subcatalogue 1'}]}
+    client.configure_unidata_server(username='newuser', password='newpass', server_url='https://example.com')
+    assert not client._etag_cache
+
+    client.get_checklists()
+    mock_get.assert_called_with(
+        'https://example.com/checklists',
+        params={'login': 'newuser', 'password': 'newpass'},
+        timeout=client.timeout,
+        headers={}
+        )
 
-@patch('requests.get')
-def test_get_intros(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'intros': [{'id': 'intro1', 'content': 'Intro Content'}]}
-    mock_get.return_value = mock_response
+@patch('requests.Session.get')
+def test_get_response_does_not_modify_params(mock_get, make_response):
+    mock_get.return_value = make_response(json={'key': 'value'})
 
     client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
-    result = client.get_intros()
+    params = {'mode': 1}
+    client.get_response('/api/someendpoint', params=params)
 
-    expected_url = 'https://example.com/intros'
-    expected_params = {'login': 'user', 'password': 'pass'}
-    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout)
-    assert result == {'intros': [{'id': 'intro1', 'content': 'Intro Content'}]}
+    assert params == {'mode': 1}
 
-@patch('requests.get')
-def test_get_checklists(mock_get):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {'checklists': [{'id': 'cl1', 'name': 'Checklist 1'}]}
-    mock_get.return_value = mock_response
+@pytest.mark.parametrize('method, kwargs, path, payload', [
+    ('get_articles', {'mode': 1}, '/articles', {'articles': [{'id': 'art1', 'title': 'Article 1'}]}),
+    ('get_subcatalogues', {}, '/lists', {'subcatalogues': [{'id': 'sc1', 'name': 'Subcatalogue 1'}]}),
+    ('get_intros', {}, '/intros', {'intros': [{'id': 'intro1', 'content': 'Intro Content'}]}),
+    ('get_checklists', {}, '/checklists', {'checklists': [{'id': 'cl1', 'name': 'Checklist 1'}]}),
+])
+@patch('requests.Session.get')
+def test_get_endpoint(mock_get, method, kwargs, path, payload, make_response):
+    mock_get.return_value = make_response(json=payload)
 
     client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
-    result = client.get_checklists()
+    result = getattr(client, method)(**kwargs)
 
-    expected_url = 'https://example.com/checklists'
-    expected_params = {'login': 'user', 'password': 'pass'}
-    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout)
-    assert result == {'checklists': [{'id': 'cl1', 'name': 'Checklist 1'}]}
\ No newline at end of file
+    expected_url = f'https://example.com{path}'
+    expected_params = {'login': 'user', 'password': 'pass', **kwargs}
+    mock_get.assert_called_with(expected_url, params=expected_params, timeout=client.timeout, headers={})
+    assert result == payload
+
+@patch('requests.Session.get')
+def test_get_checklists_cached(mock_get, make_response):
+    mock_get.return_value = make_response(json={'checklists': [{'id': 'cl1', 'name': 'Checklist 1'}]})
+
+    client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com', cache_ttl=60)
+    first_result = client.get_checklists()
+    first_result['checklists'].clear()
+
+    assert client.get_checklists() == {'checklists': [{'id': 'cl1', 'name': 'Checklist 1'}]}
+    assert mock_get.call_count == 1
+
+    client.invalidate_cache('get_checklists')
+    client.get_checklists()
+    assert mock_get.call_count == 2
+
+@patch('msftoolbox.unidata.data._API_CACHE_SIZE', 1)
+@patch('requests.Session.get')
+def test_api_cache_is_bounded(mock_get, make_response):
+    mock_get.return_value = make_response(json={'rows': []})
+
+    client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com', cache_ttl=60)
+    client.get_checklists()
+    client.get_intros()
+
+    assert [key[0] for key in client._api_cache] == ['get_intros']
+
+@patch('requests.Session.get')
+def test_api_cache_disabled_by_default(mock_get, make_response):
+    mock_get.return_value = make_response(json={'rows': []})
+
+    client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
+    client.get_intros()
+    client.get_intros()
+
+    assert mock_get.call_count == 2
+    assert not client._api_cache
+
+
+@patch('requests.Session.get')
+def test_iter_articles(mock_get, make_response):
+    pages = {
+        1: {'rows': [{'id': 'art1'}, {'id': 'art2'}]},
+        2: {'rows': [{'id': 'art3'}, {'id': 'art4'}]},
+        3: {'rows': [{'id': 'art5'}]},
+    }
+    mock_get.side_effect = lambda url, params, timeout, headers: make_response(
+        headers={'ETag': f'"page{params["page"]}"'},
+        json=pages.get(params['page'], {'rows': []})
+        )
+
+    client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com', cache_ttl=60)
+    result = list(client.iter_articles(size=2, prefetch=2, mode=1))
+
+    assert result == [{'id': 'art1'}, {'id': 'art2'}, {'id': 'art3'}, {'id': 'art4'}, {'id': 'art5'}]
+    mock_get.assert_any_call(
+        'https://example.com/articles',
+        params={'size': 2, 'page': 3, 'mode': 1, 'login': 'user', 'password': 'pass'},
+        timeout=client.timeout,
+        headers={}
+        )
+    assert not client._etag_cache
+    assert not client._api_cache
+
+@pytest.mark.parametrize('prefetch', [0, -1])
+def test_iter_articles_invalid_prefetch(prefetch):
+    client = UniDataAPIClient(username='user', password='pass', server_url='https://example.com')
+
+    with pytest.raises(ValueError, match='prefetch must be positive'):
+        client.iter_articles(prefetch=prefetch)